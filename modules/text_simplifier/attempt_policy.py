@@ -0,0 +1,177 @@
+"""
+Adaptive attempt policy learned from historical outcomes.
+
+Every generation attempt is recorded against the kind of item it was for
+(simplification level, math or not, length bucket, difficulty band) and the
+temperature step it used. Once a kind of item has enough history, the policy
+orders the temperature steps by how often they passed for that kind of item
+and drops steps that rarely pass, so each item starts at the most promising
+temperature and wastes fewer attempts.
+
+A small share of plans (the exploration rate) start with a randomly chosen
+step instead, dropped steps included. Otherwise later steps would only ever
+be tried on items that already failed once, and a dropped step could never
+recover.
+"""
+from prevalidation import PreValidationGate
+from config import config
+from typing import Dict, List, Optional
+import atexit
+import json
+import logging
+import os
+import random
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the length (words) and difficulty (composite score) buckets
+LENGTH_BUCKETS = [(20, "short"), (50, "medium")]
+DIFFICULTY_BANDS = [(40, "easy"), (60, "medium")]
+
+# Weight of the bucket-wide pass rate when estimating a rarely tried step
+PRIOR_WEIGHT = 2.0
+
+
+class AttemptPolicy:
+    """Chooses the temperature schedule (start and attempt budget) per kind of item."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        min_samples: Optional[int] = None,
+        min_pass_rate: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        explore_rate: Optional[float] = None,
+        save_every: Optional[int] = None,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Args:
+            path: JSON file the statistics are loaded from and saved to (None = in-memory only)
+            min_samples: Attempts a bucket needs before the default schedule is replaced
+            min_pass_rate: Steps whose estimated pass rate is below this are skipped
+            max_attempts: Number of temperature steps (defaults to config.MAX_ATTEMPTS)
+            explore_rate: Share of plans that start with a random step (dropped steps included)
+            save_every: Recorded attempts between writes of path by save_if_due()
+            rng: Random source for exploration (for reproducible tests)
+        """
+        self.path = path
+        self.min_samples = config.ATTEMPT_POLICY_MIN_SAMPLES if min_samples is None else min_samples
+        self.min_pass_rate = config.ATTEMPT_POLICY_MIN_PASS_RATE if min_pass_rate is None else min_pass_rate
+        self.max_attempts = max_attempts or config.MAX_ATTEMPTS
+        self.explore_rate = config.ATTEMPT_POLICY_EXPLORE_RATE if explore_rate is None else explore_rate
+        self.save_every = save_every or config.ATTEMPT_POLICY_SAVE_EVERY
+        self._rng = rng or random.Random()
+
+        self._lock = threading.Lock()
+        # bucket key -> step (as str, for JSON) -> {"tries": int, "passes": int}
+        self._stats: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._unsaved = 0
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._stats = json.load(f)
+        if path:
+            # Attempts recorded since the last batch are written on interpreter exit
+            atexit.register(self.flush)
+
+    @staticmethod
+    def bucket_key(text: str, simplification_level: str, difficulty: float) -> str:
+        """Describe an item as level|math|length bucket|difficulty band."""
+        has_math = "math" if PreValidationGate.extract_math_expressions(text) else "text"
+        num_words = len(text.split())
+        length = next((name for limit, name in LENGTH_BUCKETS if num_words < limit), "long")
+        band = next((name for limit, name in DIFFICULTY_BANDS if difficulty < limit), "hard")
+        return f"{simplification_level}|{has_math}|{length}|{band}"
+
+    def plan(self, key: str) -> List[int]:
+        """
+        Temperature steps to try, in order, for an item in this bucket.
+
+        Without enough history this is the fixed schedule 0, 1, ..., max_attempts - 1.
+        With probability explore_rate a random other step is moved (or, if it
+        was dropped, added) to the front.
+        """
+        return self._explore(self._schedule(key))
+
+    def _schedule(self, key: str) -> List[int]:
+        default = list(range(self.max_attempts))
+        with self._lock:
+            steps = {step: dict(counts) for step, counts in self._stats.get(key, {}).items()}
+
+        total_tries = sum(counts["tries"] for counts in steps.values())
+        if total_tries < self.min_samples:
+            return default
+
+        total_passes = sum(counts["passes"] for counts in steps.values())
+        prior = total_passes / total_tries
+
+        def pass_rate(step: int) -> float:
+            counts = steps.get(str(step), {"tries": 0, "passes": 0})
+            return (counts["passes"] + prior * PRIOR_WEIGHT) / (counts["tries"] + PRIOR_WEIGHT)
+
+        ranked = sorted(default, key=lambda step: (-pass_rate(step), step))
+        schedule = [step for step in ranked if pass_rate(step) >= self.min_pass_rate]
+        return schedule or ranked[:1]
+
+    def _explore(self, schedule: List[int]) -> List[int]:
+        if self.max_attempts < 2 or self._rng.random() >= self.explore_rate:
+            return schedule
+        step = self._rng.choice([step for step in range(self.max_attempts) if step != schedule[0]])
+        return [step] + [other for other in schedule if other != step]
+
+    def record(self, key: str, step: int, passed: bool):
+        """Record the outcome of one freshly generated attempt (not a cache hit)."""
+        with self._lock:
+            counts = self._stats.setdefault(key, {}).setdefault(str(step), {"tries": 0, "passes": 0})
+            counts["tries"] += 1
+            counts["passes"] += int(passed)
+            self._unsaved += 1
+
+    def save_if_due(self):
+        """Save once save_every attempts have been recorded since the last save."""
+        with self._lock:
+            due = self._unsaved >= self.save_every
+        if due:
+            self.save()
+
+    def flush(self):
+        """Save if any attempt was recorded since the last save."""
+        with self._lock:
+            pending = self._unsaved > 0
+        if pending:
+            self.save()
+
+    def save(self):
+        """Write the statistics to path atomically (no-op without a path)."""
+        if not self.path:
+            return
+        with self._lock:
+            snapshot = json.dumps(self._stats, indent=2, sort_keys=True)
+            self._unsaved = 0
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(snapshot)
+        os.replace(tmp_path, self.path)
+
+    def report(self) -> Dict[str, dict]:
+        """Per-bucket attempt counts, pass rate and the current schedule."""
+        with self._lock:
+            keys = list(self._stats)
+            totals = {
+                key: (
+                    sum(c["tries"] for c in self._stats[key].values()),
+                    sum(c["passes"] for c in self._stats[key].values()),
+                )
+                for key in keys
+            }
+        return {
+            key: {
+                "attempts": tries,
+                "pass_rate": round(passes / tries, 3) if tries else None,
+                "schedule": self._schedule(key),
+            }
+            for key, (tries, passes) in sorted(totals.items())
+        }
@@ -0,0 +1,253 @@
+"""
+Offline end-to-end benchmark for the text simplifier.
+
+Runs fixed question sets of increasing size through TextSimplifier.convert()
+against a ReplayBackend (no token or network needed) and reports items/sec,
+time per stage (LLM, embedding, difficulty, bookkeeping), attempts and LLM
+calls per item, and the memory growth of each run. Compare the JSON output of two runs to spot
+regressions:
+
+    python benchmark.py --sizes 10 50 200 --latency 0.05 --json before.json
+"""
+from text_simplifier import TextSimplifier
+from inference_backends import ReplayBackend
+from model_registry import current_rss_bytes, registry
+from models import AssessmentItem
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+import argparse
+import json
+import logging
+import threading
+import time
+import tracemalloc
+
+# Question templates; numbers vary per item so every item in a set is distinct
+QUESTION_TEMPLATES = [
+    "Calculate the derivative of the function f(x) = {a}x² + {b}x - 2 using the power rule.",
+    "Determine the value of x in the equation {a}x + {b} = 22 by performing inverse operations.",
+    "A rectangle has a length of {a} cm and a width of {b} cm. Compute its area.",
+    "Evaluate the definite integral of {a}x from x = 0 to x = {b}.",
+    "The photosynthetic process converts light energy into chemical energy through complex biochemical reactions involving chlorophyll molecules in {a} stages.",
+    "Explain the significance of the Treaty of Versailles in precipitating the Second World War, giving {a} reasons.",
+    "Describe the mechanism by which enzymes lower the activation energy of a reaction at {a} degrees Celsius.",
+    "A train travels {a} km in {b} hours. Determine its average speed in km per hour.",
+    "Identify the oxidising agent in the reaction Zn + CuSO4 → ZnSO4 + Cu and demonstrate why, in {a} sentences.",
+    "Calculate the probability of obtaining {a} heads when a fair coin is tossed {b} times.",
+]
+
+STAGES = ("llm", "embedding", "difficulty")
+
+
+def build_question_set(size: int) -> List[AssessmentItem]:
+    """Deterministic set of `size` distinct assessment items."""
+    items = []
+    for i in range(size):
+        template = QUESTION_TEMPLATES[i % len(QUESTION_TEMPLATES)]
+        a, b = 2 + i // len(QUESTION_TEMPLATES), 3 + (i * 7) % 11
+        items.append(AssessmentItem(id=f"B{i:05d}", text=template.format(a=a, b=b)))
+    return items
+
+
+class StageTimer:
+    """Accumulates time spent inside (and calls to) wrapped methods, per stage (thread-safe)."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._wrapped = []
+
+    def wrap(self, obj, attr: str, stage: str):
+        """Time obj.attr under stage; nested calls within the same stage count once."""
+        original = getattr(obj, attr)
+
+        def timed(*args, **kwargs):
+            active = self._local.__dict__.setdefault("active", set())
+            if stage in active:
+                return original(*args, **kwargs)
+            active.add(stage)
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                active.discard(stage)
+                with self._lock:
+                    self.seconds[stage] += elapsed
+                    self.calls[stage] += 1
+
+        setattr(obj, attr, timed)
+        self._wrapped.append((obj, attr))
+
+    def unwrap(self):
+        for obj, attr in self._wrapped:
+            delattr(obj, attr)
+        self._wrapped = []
+
+
+def _instrument(simplifier: TextSimplifier) -> StageTimer:
+    timer = StageTimer()
+    timer.wrap(simplifier, "convert", "total")
+    # Generation attempts, including ones served from the response cache
+    timer.wrap(simplifier, "_call_llm", "attempt")
+    timer.wrap(simplifier, "_request_completion", "llm")
+    for method in ("embed", "embed_many", "compare_to_anchor"):
+        timer.wrap(simplifier.semantic_checker, method, "embedding")
+    for method in ("calculate_difficulty", "score_many"):
+        timer.wrap(simplifier.difficulty_scorer, method, "difficulty")
+    return timer
+
+
+class RssSampler:
+    """
+    Samples this process's RSS in a background thread while a run executes.
+
+    ru_maxrss is the peak of the whole process so far (model loading and
+    earlier runs included), so it cannot show what one run needed; the
+    sampled peak minus the RSS at the start of the run can.
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start_bytes = 0
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start_bytes = self.peak_bytes = current_rss_bytes()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, current_rss_bytes())
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, current_rss_bytes())
+
+    @property
+    def peak_growth_mb(self) -> float:
+        return round((self.peak_bytes - self.start_bytes) / (1024 * 1024), 1)
+
+
+def _process_peak_rss_mb() -> Optional[float]:
+    """Peak RSS of the whole process since it started (ru_maxrss), not of one run."""
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round((peak if sys.platform == "darwin" else peak * 1024) / (1024 * 1024), 1)
+    except ImportError:
+        return None
+
+
+def run_size(
+    size: int,
+    latency: float,
+    concurrency: int = 1,
+    replay_path: Optional[str] = None,
+    trace_memory: bool = False
+) -> dict:
+    """Benchmark one question set with a fresh simplifier (cold embedding cache)."""
+    items = build_question_set(size)
+    backend = ReplayBackend(replay_path, latency=latency)
+    simplifier = TextSimplifier(backend=backend)
+    timer = _instrument(simplifier)
+
+    if trace_memory:
+        tracemalloc.start()
+    with RssSampler() as rss:
+        start = time.perf_counter()
+        if concurrency > 1:
+            results = list(simplifier.convert_many(items, concurrency=concurrency))
+        else:
+            results = [simplifier.convert(item) for item in items]
+        wall_seconds = time.perf_counter() - start
+    traced_peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+    timer.unwrap()
+
+    stage_seconds = {stage: round(timer.seconds[stage], 4) for stage in STAGES}
+    stage_seconds["bookkeeping"] = round(
+        max(timer.seconds["total"] - sum(timer.seconds[stage] for stage in STAGES), 0.0), 4
+    )
+    report = {
+        "items": size,
+        "concurrency": concurrency,
+        "wall_seconds": round(wall_seconds, 3),
+        "items_per_second": round(size / wall_seconds, 2),
+        "stage_seconds": stage_seconds,
+        "attempts_per_item": round(timer.calls["attempt"] / size, 2),
+        "llm_calls_per_item": round(backend.calls / size, 2),
+        "statuses": dict(Counter(r.status.value for r in results)),
+        # This run: RSS at the end and sampled peak, relative to its start
+        "rss_growth_mb": round(max(current_rss_bytes() - rss.start_bytes, 0) / (1024 * 1024), 1),
+        "peak_rss_growth_mb": rss.peak_growth_mb,
+        # Whole process so far (includes model loading and earlier runs)
+        "process_peak_rss_mb": _process_peak_rss_mb(),
+    }
+    if traced_peak is not None:
+        report["python_heap_peak_mb"] = round(traced_peak / (1024 * 1024), 1)
+    return report
+
+
+def run_benchmark(
+    sizes: List[int],
+    latency: float = 0.0,
+    concurrency: int = 1,
+    replay_path: Optional[str] = None,
+    trace_memory: bool = False
+) -> dict:
+    """
+    Benchmark each question-set size in turn.
+
+    Models are loaded and warmed up once beforehand; their load cost is
+    reported separately and excluded from the per-size figures.
+    """
+    warmup = TextSimplifier(backend=ReplayBackend(latency=0.0))
+    warmup.convert(build_question_set(1)[0])
+
+    return {
+        "latency": latency,
+        "model_loads": registry.report(),
+        "runs": [
+            run_size(size, latency, concurrency, replay_path, trace_memory)
+            for size in sizes
+        ],
+    }
+
+
+def _print_table(report: dict):
+    print(f"\n{'items':>6} {'items/s':>8} {'llm s':>8} {'embed s':>8} {'diff s':>8} "
+          f"{'other s':>8} {'att/item':>8} {'calls/item':>10} {'+peak MB':>8}")
+    for run in report["runs"]:
+        stages = run["stage_seconds"]
+        print(f"{run['items']:>6} {run['items_per_second']:>8} {stages['llm']:>8} "
+              f"{stages['embedding']:>8} {stages['difficulty']:>8} {stages['bookkeeping']:>8} "
+              f"{run['attempts_per_item']:>8} {run['llm_calls_per_item']:>10} {run['peak_rss_growth_mb']:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline TextSimplifier benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 200], help="Question-set sizes")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per LLM call")
+    parser.add_argument("--concurrency", type=int, default=1, help=">1 runs convert_many() with this many workers")
+    parser.add_argument("--replay", default=None, help="JSONL recording from RecordingBackend")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also trace the Python heap peak (slower)")
+    parser.add_argument("--json", default=None, help="Write the full report to this file")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    report = run_benchmark(args.sizes, args.latency, args.concurrency, args.replay, args.tracemalloc)
+    _print_table(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.json}")
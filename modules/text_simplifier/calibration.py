@@ -0,0 +1,184 @@
+"""
+Calibration report for the int8 quantized embedding mode.
+
+Encodes a fixed set of (original, simplified) question pairs with both the
+float32 and the int8 SemanticChecker and checks that no SEMANTIC_THRESHOLD
+pass/fail decision changes. Pairs whose float32 score lies within
+NEAR_THRESHOLD_MARGIN of the threshold are the ones quantization can flip,
+so their largest score change is reported separately. Run before enabling
+EMBEDDING_QUANTIZE:
+
+    python calibration.py
+"""
+from semantic_checker import SemanticChecker
+from config import config
+from typing import List, Optional, Tuple
+import json
+import time
+
+# Scores this close to the threshold are where a small int8 error flips a decision
+NEAR_THRESHOLD_MARGIN = 0.03
+
+# Fixed question set: good simplifications, borderline ones and clear failures
+CALIBRATION_PAIRS: List[Tuple[str, str]] = [
+    (
+        "Calculate the derivative of the function f(x) = 3x² + 5x - 2 using the power rule.",
+        "Find the derivative of f(x) = 3x² + 5x - 2 using the power rule.",
+    ),
+    (
+        "Determine the value of x in the equation 3x + 7 = 22 by performing inverse operations.",
+        "Find x in 3x + 7 = 22 by undoing the operations.",
+    ),
+    (
+        "The photosynthetic process converts light energy into chemical energy through complex biochemical reactions involving chlorophyll molecules.",
+        "Photosynthesis uses chlorophyll to turn light energy into chemical energy.",
+    ),
+    (
+        "Evaluate the definite integral of 2x from x = 0 to x = 4.",
+        "Work out the integral of 2x from x = 0 to x = 4.",
+    ),
+    (
+        "Explain the significance of the Treaty of Versailles in precipitating the Second World War.",
+        "Explain how the Treaty of Versailles helped cause World War II.",
+    ),
+    (
+        "A rectangle has a length of 12 cm and a width of 5 cm. Compute its area.",
+        "A rectangle is 12 cm long and 5 cm wide. Find its area.",
+    ),
+    (
+        "Describe the mechanism by which enzymes lower the activation energy of a reaction.",
+        "Describe how enzymes make it easier for a reaction to start.",
+    ),
+    (
+        "Identify the oxidising agent in the reaction Zn + CuSO4 → ZnSO4 + Cu.",
+        "Which substance is the oxidising agent in Zn + CuSO4 → ZnSO4 + Cu?",
+    ),
+    (
+        "Calculate the derivative of the function f(x) = 3x² + 5x - 2 using the power rule.",
+        "Find the area of a circle with radius 3.",
+    ),
+    (
+        "The photosynthetic process converts light energy into chemical energy through complex biochemical reactions involving chlorophyll molecules.",
+        "Name the capital city of France.",
+    ),
+]
+
+# Borderline simplifications (a detail dropped, loosened or changed), chosen to
+# score close to the default 0.85 threshold
+BORDERLINE_PAIRS: List[Tuple[str, str]] = [
+    (
+        "Calculate the probability of obtaining 3 heads when a fair coin is tossed 5 times.",
+        "What is the chance of getting 3 heads in 5 coin tosses?",
+    ),
+    (
+        "A train travels 120 km in 2 hours. Determine its average speed in km per hour.",
+        "A train goes 120 km in 2 hours. How fast does it go?",
+    ),
+    (
+        "Determine the value of x in the equation 3x + 7 = 22 by performing inverse operations.",
+        "Solve 3x + 7 = 22.",
+    ),
+    (
+        "Evaluate the definite integral of 2x from x = 0 to x = 4.",
+        "Find the area under y = 2x between 0 and 4.",
+    ),
+    (
+        "Describe the mechanism by which enzymes lower the activation energy of a reaction.",
+        "How do enzymes speed up reactions?",
+    ),
+    (
+        "Explain the significance of the Treaty of Versailles in precipitating the Second World War.",
+        "Why was the Treaty of Versailles important?",
+    ),
+    (
+        "Identify the oxidising agent in the reaction Zn + CuSO4 → ZnSO4 + Cu.",
+        "Which substance gains electrons when zinc reacts with copper sulfate?",
+    ),
+    (
+        "A rectangle has a length of 12 cm and a width of 5 cm. Compute its area.",
+        "A rectangle is 10 cm long and 5 cm wide. Find its area.",
+    ),
+    (
+        "The photosynthetic process converts light energy into chemical energy through complex biochemical reactions involving chlorophyll molecules.",
+        "Plants use sunlight to make food.",
+    ),
+    (
+        "Calculate the derivative of the function f(x) = 3x² + 5x - 2 using the power rule.",
+        "Differentiate f(x) = 3x² + 5x - 2.",
+    ),
+]
+
+
+def calibrate_quantization(
+    pairs: Optional[List[Tuple[str, str]]] = None,
+    threshold: Optional[float] = None,
+    margin: float = NEAR_THRESHOLD_MARGIN
+) -> dict:
+    """
+    Compare float32 and int8 similarity scores on a fixed set of pairs.
+
+    Args:
+        pairs: (original, simplified) pairs (defaults to CALIBRATION_PAIRS + BORDERLINE_PAIRS)
+        threshold: Decision threshold to check (defaults to config.SEMANTIC_THRESHOLD)
+        margin: Pairs with a float32 score within this distance of the threshold
+            are reported as near the threshold
+
+    Returns:
+        dict with per-pair scores, max/mean absolute score difference, the
+        number of pass/fail decisions that flip, the number of pairs near the
+        threshold and their largest score difference, and encode time per mode
+    """
+    pairs = pairs or CALIBRATION_PAIRS + BORDERLINE_PAIRS
+    threshold = config.SEMANTIC_THRESHOLD if threshold is None else threshold
+
+    scores = {}
+    encode_seconds = {}
+    for label, quantize in (("float32", False), ("int8", True)):
+        # Caching is disabled so both modes do the full encode work
+        checker = SemanticChecker(cache_size=0, cache_dir="", quantize=quantize)
+        checker.model.encode(["warm up"])
+        start = time.perf_counter()
+        scores[label] = [checker.check_similarity(original, simplified) for original, simplified in pairs]
+        encode_seconds[label] = round(time.perf_counter() - start, 4)
+
+    rows = []
+    for (original, simplified), fp32, int8 in zip(pairs, scores["float32"], scores["int8"]):
+        rows.append({
+            "original": original,
+            "simplified": simplified,
+            "float32": round(fp32, 4),
+            "int8": round(int8, 4),
+            "abs_diff": round(abs(fp32 - int8), 4),
+            "near_threshold": abs(fp32 - threshold) <= margin,
+            "decision_flipped": (fp32 >= threshold) != (int8 >= threshold),
+        })
+
+    diffs = [row["abs_diff"] for row in rows]
+    near_diffs = [row["abs_diff"] for row in rows if row["near_threshold"]]
+    return {
+        "threshold": threshold,
+        "num_pairs": len(rows),
+        "max_abs_diff": max(diffs),
+        "mean_abs_diff": round(sum(diffs) / len(diffs), 4),
+        "near_threshold_margin": margin,
+        "near_threshold_pairs": len(near_diffs),
+        "near_threshold_max_abs_diff": max(near_diffs) if near_diffs else None,
+        "decision_flips": sum(row["decision_flipped"] for row in rows),
+        "encode_seconds": encode_seconds,
+        "pairs": rows,
+    }
+
+
+if __name__ == "__main__":
+    report = calibrate_quantization()
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if report["decision_flips"]:
+        print(f"\n⚠️ {report['decision_flips']} threshold decision(s) change under int8 - keep EMBEDDING_QUANTIZE=false")
+    else:
+        print(f"\n✓ No threshold decisions change (max score difference {report['max_abs_diff']})")
+    if report["near_threshold_pairs"]:
+        print(f"  {report['near_threshold_pairs']} pair(s) within ±{report['near_threshold_margin']} of "
+              f"{report['threshold']}: max score difference {report['near_threshold_max_abs_diff']}")
+    else:
+        print(f"⚠️ No pair scored within ±{report['near_threshold_margin']} of {report['threshold']} - "
+              f"add borderline pairs before trusting this report")
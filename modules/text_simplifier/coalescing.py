@@ -0,0 +1,76 @@
+"""
+Single-flight coalescing of identical concurrent requests.
+
+When several callers ask for the same work at the same time, only the first
+(the leader) runs it; the others wait for the leader and receive its result.
+Once the work finishes the key is released, so later calls run afresh.
+"""
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share a key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: Optional[float] = None) -> Tuple[Any, bool]:
+        """
+        Run fn() unless an identical call is already in flight.
+
+        Args:
+            key: Identifies identical calls
+            fn: The work, run by the leader only
+            timeout: Longest a waiting caller blocks for the leader (None = no limit)
+
+        Returns:
+            (value, shared) where shared is True if the value came from another
+            caller's in-flight call. Errors raised by the leader are re-raised
+            in every waiting caller; a waiting caller whose timeout expires
+            first gets TimeoutError (the leader keeps running).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise TimeoutError("Timed out waiting for an identical in-flight call")
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self.leaders, "coalesced": self.coalesced}
@@ -16,15 +16,82 @@ class Config:
         self.DIFFICULTY_THRESHOLD: float = float(os.getenv("DIFFICULTY_THRESHOLD", "10.0"))
         self.MAX_ATTEMPTS: int = int(os.getenv("MAX_ATTEMPTS", "3"))
         
+        # Pre-validation gate (cheap checks run before embedding/difficulty scoring)
+        self.PREVALIDATION_ENABLED: bool = os.getenv("PREVALIDATION_ENABLED", "true").lower() == "true"
+        self.PREVALIDATION_MAX_LENGTH_RATIO: float = float(os.getenv("PREVALIDATION_MAX_LENGTH_RATIO", "2.5"))
+        self.PREVALIDATION_MIN_LENGTH_RATIO: float = float(os.getenv("PREVALIDATION_MIN_LENGTH_RATIO", "0.25"))
+        
+        # Inference backend: "huggingface" (live API) or "replay" (offline, recorded/synthetic)
+        self.INFERENCE_BACKEND: str = os.getenv("INFERENCE_BACKEND", "huggingface")
+        self.REPLAY_PATH: str = os.getenv("REPLAY_PATH", "")
+        self.REPLAY_LATENCY: float = float(os.getenv("REPLAY_LATENCY", "0.0"))
+        
         # Model configuration
         self.LLM_MODEL: str = os.getenv("LLM_MODEL", "meta-llama/Llama-3.2-3B-Instruct")
         self.EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
         self.SPACY_MODEL: str = os.getenv("SPACY_MODEL", "en_core_web_sm")
+        self.EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+        self.EMBEDDING_QUANTIZE: bool = os.getenv("EMBEDDING_QUANTIZE", "false").lower() == "true"
+        
+        # Difficulty scoring
+        self.SYLLABLE_CACHE_SIZE: int = int(os.getenv("SYLLABLE_CACHE_SIZE", "50000"))
+        self.SPACY_PIPELINE_MODE: str = os.getenv("SPACY_PIPELINE_MODE", "full")
+        self.SPACY_BATCH_SIZE: int = int(os.getenv("SPACY_BATCH_SIZE", "64"))
+        self.SPACY_N_PROCESS: int = int(os.getenv("SPACY_N_PROCESS", "1"))
+        
+        # Embedding cache
+        self.EMBEDDING_CACHE_SIZE: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+        self.EMBEDDING_CACHE_DIR: str = os.getenv("EMBEDDING_CACHE_DIR", "")
         
         # Generation parameters
         self.BASE_TEMPERATURE: float = float(os.getenv("BASE_TEMPERATURE", "0.3"))
         self.TEMPERATURE_INCREMENT: float = float(os.getenv("TEMPERATURE_INCREMENT", "0.15"))
         self.MAX_TOKENS: int = int(os.getenv("MAX_TOKENS", "300"))
+        
+        # Stream tokens and abort generations that run too long or add commentary
+        self.LLM_STREAMING: bool = os.getenv("LLM_STREAMING", "false").lower() == "true"
+        
+        # Time budget per convert() call in seconds (0 = no limit)
+        self.CONVERT_DEADLINE: float = float(os.getenv("CONVERT_DEADLINE", "0"))
+        
+        # Adaptive attempt policy (learned temperature schedule per kind of item)
+        self.ADAPTIVE_ATTEMPTS: bool = os.getenv("ADAPTIVE_ATTEMPTS", "false").lower() == "true"
+        self.ATTEMPT_POLICY_PATH: str = os.getenv("ATTEMPT_POLICY_PATH", "")
+        self.ATTEMPT_POLICY_MIN_SAMPLES: int = int(os.getenv("ATTEMPT_POLICY_MIN_SAMPLES", "20"))
+        self.ATTEMPT_POLICY_MIN_PASS_RATE: float = float(os.getenv("ATTEMPT_POLICY_MIN_PASS_RATE", "0.1"))
+        self.ATTEMPT_POLICY_EXPLORE_RATE: float = float(os.getenv("ATTEMPT_POLICY_EXPLORE_RATE", "0.05"))
+        self.ATTEMPT_POLICY_SAVE_EVERY: int = int(os.getenv("ATTEMPT_POLICY_SAVE_EVERY", "50"))
+        
+        # Speculative generation: request this many candidates (at the escalating
+        # temperatures) in parallel instead of retrying sequentially. 0 = disabled.
+        self.SPECULATIVE_CANDIDATES: int = int(os.getenv("SPECULATIVE_CANDIDATES", "0"))
+        
+        # Inference request scheduling (rate limit 0 / in-flight 0 = unlimited)
+        self.LLM_RATE_LIMIT_PER_MINUTE: float = float(os.getenv("LLM_RATE_LIMIT_PER_MINUTE", "0"))
+        self.LLM_RATE_BURST: int = int(os.getenv("LLM_RATE_BURST", "0"))
+        self.LLM_MAX_IN_FLIGHT: int = int(os.getenv("LLM_MAX_IN_FLIGHT", "0"))
+        self.LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "4"))
+        self.LLM_BACKOFF_BASE: float = float(os.getenv("LLM_BACKOFF_BASE", "1.0"))
+        self.LLM_BACKOFF_MAX: float = float(os.getenv("LLM_BACKOFF_MAX", "30.0"))
+        self.HTTP_POOL_SIZE: int = int(os.getenv("HTTP_POOL_SIZE", "16"))
+        
+        # LLM response cache (disabled when LLM_CACHE_PATH is empty)
+        self.LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "")
+        self.LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+        self.LLM_CACHE_MAX_AGE_DAYS: float = float(os.getenv("LLM_CACHE_MAX_AGE_DAYS", "30"))
+        self.LLM_CACHE_BYPASS: bool = os.getenv("LLM_CACHE_BYPASS", "false").lower() == "true"
+        
+        # Near-duplicate index: reuse validated results for near-identical originals
+        self.DUPLICATE_INDEX_ENABLED: bool = os.getenv("DUPLICATE_INDEX_ENABLED", "false").lower() == "true"
+        self.DUPLICATE_INDEX_PATH: str = os.getenv("DUPLICATE_INDEX_PATH", "")
+        self.DUPLICATE_THRESHOLD: float = float(os.getenv("DUPLICATE_THRESHOLD", "0.95"))
+        
+        # Share one computation between concurrent identical convert() requests
+        self.COALESCE_REQUESTS: bool = os.getenv("COALESCE_REQUESTS", "true").lower() == "true"
+        
+        # Batch processing
+        self.BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "4"))
+        self.WORKER_PROCESSES: int = int(os.getenv("WORKER_PROCESSES") or os.cpu_count() or 1)
     
     def validate(self) -> bool:
         """Validate that required configuration is present."""
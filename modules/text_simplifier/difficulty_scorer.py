@@ -1,32 +1,88 @@
-import textstat
-import spacy
+from readability import ReadabilityEngine
+from model_registry import get_blank_spacy, get_spacy_model
+from config import config
+from typing import Iterable, List, Optional
+
+# Components of en_core_web_sm that difficulty scoring never reads. Only the
+# tokenizer (is_punct / is_space) and sentence boundaries are needed.
+UNUSED_COMPONENTS = ["tagger", "attribute_ruler", "lemmatizer", "ner"]
 
 class DifficultyScorer:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-    
+    def __init__(self, pipeline_mode: Optional[str] = None):
+        """
+        Args:
+            pipeline_mode: "full" (complete model), "light" (model without tagger,
+                lemmatizer and NER; parser kept for sentence boundaries) or
+                "sentencizer" (blank English pipeline + rule-based sentencizer,
+                no statistical model at all). Defaults to config.SPACY_PIPELINE_MODE.
+        """
+        self.pipeline_mode = pipeline_mode or config.SPACY_PIPELINE_MODE
+        self.nlp = self._load_pipeline(self.pipeline_mode)
+        self.engine = ReadabilityEngine()
+
     def calculate_difficulty(self, text: str):
         """Calculate composite difficulty score (0-100, higher = harder)."""
-        flesch_reading_ease = textstat.flesch_reading_ease(text)
-        flesch_kincaid_grade = textstat.flesch_kincaid_grade(text)
-        
-        doc = self.nlp(text)
-        num_words = len([token for token in doc if not token.is_punct])
-        num_sentences = len(list(doc.sents))
-        
-        avg_word_length = sum(len(token.text) for token in doc if not token.is_punct) / max(num_words, 1)
-        avg_sentence_length = num_words / max(num_sentences, 1)
-        
+        return self._composite(self.engine.analyze_doc(self.nlp(text)))
+
+    def score_many(
+        self,
+        texts: Iterable[str],
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Batch variant of calculate_difficulty() that streams texts through nlp.pipe.
+
+        Args:
+            texts: Texts to score
+            batch_size: Texts per nlp.pipe batch (defaults to config.SPACY_BATCH_SIZE)
+            n_process: Worker processes for nlp.pipe (defaults to config.SPACY_N_PROCESS)
+        """
+        docs = self.nlp.pipe(
+            texts,
+            batch_size=batch_size or config.SPACY_BATCH_SIZE,
+            n_process=n_process or config.SPACY_N_PROCESS
+        )
+        return [self._composite(self.engine.analyze_doc(doc)) for doc in docs]
+
+    @staticmethod
+    def relative_change(original_score: float, simplified_score: float) -> float:
+        """Difficulty change in percent of the original composite score."""
+        if original_score > 0:
+            return abs(simplified_score - original_score) / original_score * 100
+        return 0
+
+    @staticmethod
+    def _load_pipeline(mode: str):
+        # Pipelines come from the shared registry, so scorers and other modules
+        # in the same process reuse one loaded instance
+        if mode == "full":
+            return get_spacy_model(config.SPACY_MODEL)
+        if mode == "light":
+            return get_spacy_model(config.SPACY_MODEL, exclude=UNUSED_COMPONENTS)
+        if mode == "sentencizer":
+            return get_blank_spacy("en", ["sentencizer"])
+        raise ValueError(
+            f"Unknown spaCy pipeline mode '{mode}'. Use 'full', 'light' or 'sentencizer'."
+        )
+
+    @staticmethod
+    def _composite(metrics: dict) -> dict:
+        flesch_reading_ease = metrics["flesch_reading_ease"]
+        flesch_kincaid_grade = metrics["flesch_kincaid_grade"]
+        avg_word_length = metrics["avg_word_length"]
+        avg_sentence_length = metrics["avg_sentence_length"]
+
         # Normalize metrics to 0-100 scale
         normalized_fre = max(0, min(100, (100 - flesch_reading_ease)))
         normalized_fkg = max(0, min(100, (flesch_kincaid_grade / 18) * 100))
         normalized_awl = max(0, min(100, ((avg_word_length - 3) / 5) * 100))
         normalized_asl = max(0, min(100, ((avg_sentence_length - 10) / 20) * 100))
-        
+
         # Weighted composite score
-        composite = (normalized_fre * 0.3 + normalized_fkg * 0.3 + 
+        composite = (normalized_fre * 0.3 + normalized_fkg * 0.3 +
                     normalized_awl * 0.2 + normalized_asl * 0.2)
-        
+
         return {
             "composite_difficulty": round(composite, 2),
             "flesch_reading_ease": round(flesch_reading_ease, 2),
@@ -0,0 +1,231 @@
+"""
+Near-duplicate index over previously validated simplifications.
+
+Question banks repeat themselves: the same wording across sections, or the
+same question with different coefficients. The index stores the normalized
+embedding of every validated original in a memory-mapped NumPy matrix, so
+convert() can find a near-identical earlier item and reuse (or adapt) its
+validated simplification instead of calling the LLM again.
+"""
+from typing import Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import re
+import threading
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+
+def adapt_simplification(indexed_original: str, indexed_simplified: str, new_original: str) -> Optional[str]:
+    """
+    Carry an indexed simplification over to a near-identical new original.
+
+    Only numbers may differ between the two originals (e.g. coefficients);
+    they are substituted position by position in the simplification. Returns
+    None when any other wording differs ("area" vs "circumference", "+" vs
+    "-") or the numbers cannot be mapped unambiguously.
+    """
+    if indexed_original == new_original:
+        return indexed_simplified
+    if NUMBER_PATTERN.sub("#", indexed_original) != NUMBER_PATTERN.sub("#", new_original):
+        return None
+
+    old_numbers = NUMBER_PATTERN.findall(indexed_original)
+    new_numbers = NUMBER_PATTERN.findall(new_original)
+    if len(old_numbers) != len(new_numbers):
+        return None
+
+    mapping: Dict[str, str] = {}
+    for old, new in zip(old_numbers, new_numbers):
+        if mapping.setdefault(old, new) != new:
+            return None
+
+    return NUMBER_PATTERN.sub(lambda m: mapping.get(m.group(0), m.group(0)), indexed_simplified)
+
+
+class NearDuplicateIndex:
+    """
+    Exact nearest-neighbour search over a growing, memory-mapped embedding matrix.
+
+    With a directory path the index persists across runs as `embeddings.npy`
+    (memory-mapped), an append-only `entries.jsonl` and `rows.json`, the
+    number of rows completely written; without one it lives in memory only.
+    """
+
+    def __init__(self, path: Optional[str] = None, initial_capacity: int = 1024):
+        """
+        Args:
+            path: Directory for the persistent index (None = in-memory only)
+            initial_capacity: Rows allocated up front; the matrix doubles when full
+        """
+        self.path = path
+        self.initial_capacity = initial_capacity
+        self._lock = threading.Lock()
+        self._entries: List[dict] = []
+        self._matrix: Optional[np.ndarray] = None
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._matrix_path = os.path.join(path, "embeddings.npy")
+            self._entries_path = os.path.join(path, "entries.jsonl")
+            self._rows_path = os.path.join(path, "rows.json")
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(
+        self,
+        original_text: str,
+        embedding: np.ndarray,
+        simplified_text: str,
+        simplification_level: str,
+        preserve_math: bool
+    ):
+        """Index a validated (original, simplified) pair."""
+        vector = self._normalize(embedding)
+        entry = {
+            "original": original_text,
+            "simplified": simplified_text,
+            "level": simplification_level,
+            "preserve_math": preserve_math,
+        }
+        with self._lock:
+            row = len(self._entries)
+            self._ensure_capacity(row + 1, vector.shape[0])
+            self._matrix[row] = vector
+            if self.path:
+                # Row first, then its entry, then the row count that commits both
+                self._matrix.flush()
+                with open(self._entries_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self._write_row_count(row + 1)
+            self._entries.append(entry)
+
+    def search(
+        self,
+        embedding: np.ndarray,
+        simplification_level: str,
+        preserve_math: bool,
+        threshold: float
+    ) -> Optional[Tuple[dict, float]]:
+        """
+        Return (entry, similarity) of the most similar indexed original with the
+        same level and math setting, or None if nothing reaches threshold.
+        """
+        query = self._normalize(embedding)
+        with self._lock:
+            count = len(self._entries)
+            if count == 0:
+                return None
+            scores = self._matrix[:count] @ query
+            entries = self._entries[:count]
+
+        mask = np.fromiter(
+            (e["level"] == simplification_level and e["preserve_math"] == preserve_math for e in entries),
+            dtype=bool,
+            count=count
+        )
+        scores = np.where(mask, scores, -1.0)
+        best = int(np.argmax(scores))
+        if scores[best] < threshold:
+            return None
+        return entries[best], float(scores[best])
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+    def _ensure_capacity(self, rows: int, dim: int):
+        if self._matrix is not None and self._matrix.shape[0] >= rows:
+            return
+
+        capacity = self.initial_capacity
+        if self._matrix is not None:
+            capacity = self._matrix.shape[0]
+        while capacity < rows:
+            capacity *= 2
+
+        if not self.path:
+            grown = np.zeros((capacity, dim), dtype=np.float32)
+            if self._matrix is not None:
+                grown[:len(self._entries)] = self._matrix[:len(self._entries)]
+            self._matrix = grown
+            return
+
+        # Grow the memory-mapped file: write a bigger copy, then swap it in
+        tmp_path = self._matrix_path + ".tmp"
+        grown = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float32, shape=(capacity, dim))
+        if self._matrix is not None:
+            grown[:len(self._entries)] = self._matrix[:len(self._entries)]
+        grown.flush()
+        del grown
+        self._matrix = None
+        os.replace(tmp_path, self._matrix_path)
+        self._matrix = np.lib.format.open_memmap(self._matrix_path, mode="r+")
+
+    def _load(self):
+        self._repair_entries()
+        if not os.path.exists(self._matrix_path):
+            if os.path.exists(self._entries_path):
+                logger.warning("⚠️ Duplicate index matrix missing; starting a new index")
+            self._write_entries([])
+            self._write_row_count(0)
+            return
+
+        self._matrix = np.lib.format.open_memmap(self._matrix_path, mode="r+")
+        entries = []
+        if os.path.exists(self._entries_path):
+            with open(self._entries_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entries.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break  # corrupt line; later rows are not trusted
+
+        # Only rows whose count was committed are trusted (an index written
+        # before rows.json existed falls back to its complete entries)
+        rows = self._read_row_count()
+        count = min(len(entries) if rows is None else rows, len(entries), self._matrix.shape[0])
+        if count != len(entries):
+            logger.warning(f"⚠️ Dropping {len(entries) - count} uncommitted duplicate index entries")
+            self._write_entries(entries[:count])
+        if count != rows:
+            self._write_row_count(count)
+        self._entries = entries[:count]
+
+    def _repair_entries(self):
+        """Drop a torn final line left by a crash mid-write, so new entries start on a fresh line."""
+        if not os.path.exists(self._entries_path):
+            return
+        with open(self._entries_path, "rb+") as f:
+            data = f.read()
+            if not data or data.endswith(b"\n"):
+                return
+            f.truncate(data.rfind(b"\n") + 1)
+        logger.warning("⚠️ Removed an incomplete entry at the end of the duplicate index")
+
+    def _read_row_count(self) -> Optional[int]:
+        try:
+            with open(self._rows_path, encoding="utf-8") as f:
+                return int(json.load(f)["rows"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_row_count(self, rows: int):
+        tmp_path = self._rows_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"rows": rows}, f)
+        os.replace(tmp_path, self._rows_path)
+
+    def _write_entries(self, entries: List[dict]):
+        tmp_path = self._entries_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self._entries_path)
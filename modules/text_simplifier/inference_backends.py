@@ -0,0 +1,225 @@
+"""
+Pluggable inference backends for the text simplifier.
+
+TextSimplifier talks to its LLM through one method, chat_completion(), with
+the same arguments and response shape as huggingface_hub's InferenceClient.
+Besides the live Hugging Face backend this module provides:
+
+- RecordingBackend: wraps another backend and saves every completion to a
+  JSONL file
+- ReplayBackend: serves recorded completions (or synthetic ones for prompts
+  it has not seen) with configurable latency, so the whole pipeline can run
+  offline, e.g. for benchmark.py
+"""
+from response_cache import ResponseCache
+from config import config
+from abc import ABC, abstractmethod
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+import json
+import random
+import re
+import threading
+import time
+
+# Word substitutions used to synthesize plausible simplifications
+SYNTHETIC_SUBSTITUTIONS = {
+    "calculate": "find",
+    "determine": "find",
+    "compute": "find",
+    "evaluate": "work out",
+    "utilize": "use",
+    "demonstrate": "show",
+    "approximately": "about",
+    "subsequently": "then",
+    "sufficient": "enough",
+    "performing": "doing",
+    "identify": "name",
+    "describe": "tell",
+}
+LEVEL_LINE = re.compile(r"^([A-Z]+): <simplified question>$", re.MULTILINE)
+
+
+def _completion(text: str):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+
+def _chunks(text: str) -> Iterator:
+    for word in re.findall(r"\S+\s*", text):
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=word))])
+
+
+def _prompt_of(messages: List[dict]) -> str:
+    return "\n".join(message["content"] for message in messages)
+
+
+class InferenceBackend(ABC):
+    """Interface of an LLM backend (mirrors InferenceClient.chat_completion)."""
+
+    @abstractmethod
+    def chat_completion(
+        self,
+        messages: List[dict],
+        model: str,
+        max_tokens: int,
+        temperature: float,
+        stream: bool = False
+    ):
+        """
+        Returns:
+            An object with choices[0].message.content, or with stream=True an
+            iterator of chunks with choices[0].delta.content
+        """
+
+
+class HuggingFaceBackend(InferenceBackend):
+    """Live Hugging Face Inference API."""
+
+    def __init__(self, token: str):
+        from huggingface_hub import InferenceClient
+        self.client = InferenceClient(token=token)
+
+    def chat_completion(self, messages, model, max_tokens, temperature, stream=False):
+        return self.client.chat_completion(
+            messages=messages,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=stream
+        )
+
+
+class RecordingBackend(InferenceBackend):
+    """Forwards to another backend and appends every completion to a JSONL file."""
+
+    def __init__(self, inner: InferenceBackend, path: str):
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+
+    def chat_completion(self, messages, model, max_tokens, temperature, stream=False):
+        key = ResponseCache.make_key(model, _prompt_of(messages), temperature, max_tokens)
+        response = self.inner.chat_completion(
+            messages=messages, model=model, max_tokens=max_tokens, temperature=temperature, stream=stream
+        )
+        if not stream:
+            self._record(key, response.choices[0].message.content)
+            return response
+        return self._record_stream(key, response)
+
+    def _record_stream(self, key: str, stream) -> Iterator:
+        parts = []
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            yield chunk
+        # Only complete streams are recorded
+        self._record(key, "".join(parts))
+
+    def _record(self, key: str, text: str):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "response": text}, ensure_ascii=False) + "\n")
+
+
+class ReplayBackend(InferenceBackend):
+    """
+    Serves recorded completions offline, with simulated latency.
+
+    Prompts without a recording get a synthetic simplification (the question
+    with common words replaced) unless synthesize=False, in which case a
+    KeyError is raised.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        latency: Optional[float] = None,
+        jitter: float = 0.0,
+        synthesize: bool = True,
+        seed: int = 0
+    ):
+        """
+        Args:
+            path: JSONL file written by RecordingBackend (None = synthetic only)
+            latency: Seconds per completion (defaults to config.REPLAY_LATENCY)
+            jitter: Extra uniformly random latency, up to this many seconds
+            synthesize: Generate completions for unrecorded prompts
+            seed: Seed for the latency jitter
+        """
+        self.latency = config.REPLAY_LATENCY if latency is None else latency
+        self.jitter = jitter
+        self.synthesize = synthesize
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._responses: Dict[str, str] = {}
+        if path:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    self._responses[record["key"]] = record["response"]
+
+    def chat_completion(self, messages, model, max_tokens, temperature, stream=False):
+        prompt = _prompt_of(messages)
+        key = ResponseCache.make_key(model, prompt, temperature, max_tokens)
+        text = self._responses.get(key)
+        if text is None:
+            if not self.synthesize:
+                raise KeyError(f"No recorded completion for prompt: {prompt[:60]}...")
+            text = self.synthesize_completion(prompt)
+
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if stream:
+            return self._delayed_chunks(text, delay)
+        time.sleep(delay)
+        return _completion(text)
+
+    @staticmethod
+    def _delayed_chunks(text: str, delay: float) -> Iterator:
+        chunks = list(_chunks(text))
+        for chunk in chunks:
+            time.sleep(delay / max(len(chunks), 1))
+            yield chunk
+
+    @staticmethod
+    def synthesize_completion(prompt: str) -> str:
+        """Build a plausible answer to a simplification (or multi-level) prompt."""
+        question = prompt.split("QUESTION:", 1)[-1].strip().split("\n", 1)[0].strip()
+
+        def simplify(text: str) -> str:
+            def replace(match):
+                word = match.group(0)
+                simple = SYNTHETIC_SUBSTITUTIONS.get(word.lower())
+                if simple is None:
+                    return word
+                return simple.capitalize() if word[0].isupper() else simple
+            return re.sub(r"[A-Za-z]+", replace, text)
+
+        levels = LEVEL_LINE.findall(prompt)
+        if levels:
+            return "\n".join(f"{level}: {simplify(question)}" for level in levels)
+        return simplify(question)
+
+
+def create_backend(name: Optional[str] = None, hf_token: Optional[str] = None) -> InferenceBackend:
+    """
+    Build the backend selected by name (defaults to config.INFERENCE_BACKEND).
+
+    "huggingface" needs a token; "replay" reads config.REPLAY_PATH and
+    config.REPLAY_LATENCY.
+    """
+    name = (name or config.INFERENCE_BACKEND).lower()
+    if name == "replay":
+        return ReplayBackend(config.REPLAY_PATH or None)
+    if name == "huggingface":
+        token = hf_token or config.HF_TOKEN
+        if not token:
+            raise ValueError("HF_TOKEN is required. Set it in .env file or pass to constructor.")
+        return HuggingFaceBackend(token)
+    raise ValueError(f"Unknown inference backend: {name!r} (expected 'huggingface' or 'replay')")
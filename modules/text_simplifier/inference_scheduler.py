@@ -0,0 +1,324 @@
+"""
+Client-side scheduling for LLM inference requests.
+
+Every chat_completion call goes through a RequestScheduler, which:
+- paces requests with a token bucket sized to the provider quota,
+- caps the number of requests in flight,
+- retries rate-limited (429), transient 5xx and connection errors with
+  full-jitter exponential backoff (honouring Retry-After), so these errors no
+  longer consume the simplifier's validation attempts,
+- keeps queue-depth / retry / latency counters for monitoring.
+
+Streamed requests keep their in-flight slot until the stream is used up or
+closed, so LLM_MAX_IN_FLIGHT also bounds open streams. A caller that gives up
+on a request (cancel_event) stops it from waiting for a slot or a token and
+from being retried.
+
+configure_connection_pool() makes every Hugging Face HTTP session share one
+pool of keep-alive connections.
+"""
+from config import config
+from typing import Any, Callable, Optional
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# How often a request waiting for an in-flight slot checks its cancel_event
+CANCEL_POLL_SECONDS = 0.1
+
+
+class RequestCancelled(Exception):
+    """Raised by RequestScheduler.call when the caller's cancel_event is set before a (re)try."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate_per_minute` tokens refill continuously up to `burst`."""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(self.rate_per_second)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cancel_event: Optional[threading.Event] = None) -> bool:
+        """Block until a token is available, then take it; False (no token) if cancel_event is set first."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate_per_second
+            if cancel_event is None:
+                time.sleep(wait)
+            elif cancel_event.wait(wait):
+                return False
+
+    def available(self) -> float:
+        with self._lock:
+            elapsed = time.monotonic() - self._updated
+            return min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for rate limiting, transient server errors, timeouts and dropped connections."""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    try:
+        import requests
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+    except ImportError:
+        return False
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Delay requested by the server's Retry-After header (seconds form), if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return max(float(headers.get("Retry-After")), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class _HeldStream:
+    """Iterator over a streamed response that releases its scheduler slot once exhausted or closed."""
+
+    def __init__(self, stream, release: Callable[[bool], None]):
+        self._stream = stream
+        self._iterator = iter(stream)
+        self._release = release
+        self._released = False
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._iterator)
+        except StopIteration:
+            self._finish(completed=True)
+            raise
+        except BaseException:
+            self._finish(completed=False)
+            raise
+
+    def close(self):
+        self._finish(completed=True)
+
+    def _finish(self, completed: bool):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        try:
+            close = getattr(self._stream, "close", None)
+            if close is not None:
+                close()
+        finally:
+            self._release(completed)
+
+    def __del__(self):
+        # Backstop for streams that are dropped without being closed
+        self._finish(completed=False)
+
+
+class RequestScheduler:
+    """Rate limits, bounds concurrency and retries calls to the inference API."""
+
+    def __init__(
+        self,
+        rate_per_minute: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: Optional[float] = None
+    ):
+        """
+        Args:
+            rate_per_minute: Request quota (defaults to config.LLM_RATE_LIMIT_PER_MINUTE, 0 = unlimited)
+            burst: Requests allowed back to back (defaults to config.LLM_RATE_BURST)
+            max_in_flight: Concurrent requests (defaults to config.LLM_MAX_IN_FLIGHT, 0 = unlimited)
+            max_retries: Retries per request (defaults to config.LLM_MAX_RETRIES)
+            backoff_base: First backoff ceiling in seconds (defaults to config.LLM_BACKOFF_BASE)
+            backoff_max: Largest backoff in seconds (defaults to config.LLM_BACKOFF_MAX)
+        """
+        rate_per_minute = config.LLM_RATE_LIMIT_PER_MINUTE if rate_per_minute is None else rate_per_minute
+        max_in_flight = config.LLM_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight
+        self.bucket = TokenBucket(rate_per_minute, burst or config.LLM_RATE_BURST or None) if rate_per_minute > 0 else None
+        self._slots = threading.BoundedSemaphore(max_in_flight) if max_in_flight > 0 else None
+        self.max_retries = config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = config.LLM_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = config.LLM_BACKOFF_MAX if backoff_max is None else backoff_max
+
+        self._lock = threading.Lock()
+        self._counters = {
+            "queued": 0,
+            "in_flight": 0,
+            "completed": 0,
+            "failed": 0,
+            "retries": 0,
+            "throttled": 0,
+            "max_queued": 0,
+            "cancelled": 0,
+        }
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def call(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        cancel_event: Optional[threading.Event] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run fn(*args, **kwargs) under the rate limit, retrying transient failures.
+
+        Non-retryable errors, and retryable ones after max_retries, are re-raised.
+        With stream=True the returned stream holds its in-flight slot until it
+        is used up or closed. Once cancel_event is set, the request stops
+        waiting for a slot or token and is not retried (RequestCancelled); a
+        call already sent to the server cannot be interrupted.
+        """
+        attempt = 0
+        while True:
+            self._count("queued", 1)
+            try:
+                try:
+                    self._acquire(cancel_event)
+                finally:
+                    self._count("queued", -1)
+                self._count("in_flight", 1)
+                started = time.monotonic()
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException:
+                    self._finish(started, completed=False)
+                    raise
+            except RequestCancelled:
+                self._count("cancelled", 1)
+                raise
+            except Exception as e:
+                if _status_code(e) == 429:
+                    self._count("throttled", 1)
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self._count("failed", 1)
+                    raise
+                attempt += 1
+                self._count("retries", 1)
+                delay = self._backoff(attempt, e)
+                logger.warning(f"  ⏳ Inference request failed ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                if cancel_event is None:
+                    time.sleep(delay)
+                elif cancel_event.wait(delay):
+                    self._count("cancelled", 1)
+                    raise RequestCancelled() from e
+                continue
+
+            if kwargs.get("stream"):
+                return _HeldStream(result, lambda completed: self._finish(started, completed))
+            self._finish(started, completed=True)
+            return result
+
+    def _acquire(self, cancel_event: Optional[threading.Event]):
+        """Take an in-flight slot and a rate token, or raise RequestCancelled without holding either."""
+        if cancel_event is not None and cancel_event.is_set():
+            raise RequestCancelled()
+        if self._slots is not None:
+            if cancel_event is None:
+                self._slots.acquire()
+            else:
+                while not self._slots.acquire(timeout=CANCEL_POLL_SECONDS):
+                    if cancel_event.is_set():
+                        raise RequestCancelled()
+        if self.bucket is not None and not self.bucket.acquire(cancel_event):
+            if self._slots is not None:
+                self._slots.release()
+            raise RequestCancelled()
+
+    def _finish(self, started: float, completed: bool):
+        """Free the in-flight slot of one request; completed ones count towards latency."""
+        latency = time.monotonic() - started
+        with self._lock:
+            self._counters["in_flight"] -= 1
+            if completed:
+                self._counters["completed"] += 1
+                self._latency_total += latency
+                self._latency_max = max(self._latency_max, latency)
+        if self._slots is not None:
+            self._slots.release()
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        delay = random.uniform(0, ceiling)
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def _count(self, name: str, delta: int):
+        with self._lock:
+            self._counters[name] += delta
+            if name == "queued":
+                self._counters["max_queued"] = max(self._counters["max_queued"], self._counters["queued"])
+
+    def metrics(self) -> dict:
+        """Current queue depth and in-flight count plus cumulative counters and latency."""
+        with self._lock:
+            metrics = dict(self._counters)
+            completed = self._counters["completed"]
+            metrics["latency_avg_seconds"] = round(self._latency_total / completed, 4) if completed else 0.0
+            metrics["latency_max_seconds"] = round(self._latency_max, 4)
+        if self.bucket is not None:
+            metrics["tokens_available"] = round(self.bucket.available(), 2)
+        return metrics
+
+
+def configure_connection_pool(pool_size: Optional[int] = None):
+    """
+    Route all huggingface_hub HTTP traffic through one shared connection pool.
+
+    huggingface_hub creates a session per thread, so with short-lived batch
+    threads every new thread would open fresh TCP/TLS connections. Mounting a
+    single thread-safe adapter on every session keeps up to pool_size
+    (defaults to config.HTTP_POOL_SIZE) keep-alive connections per host that
+    all threads reuse.
+    """
+    pool_size = pool_size or config.HTTP_POOL_SIZE
+    import requests
+    from huggingface_hub import configure_http_backend
+    try:
+        # Keeps the per-request trace id header huggingface_hub normally adds
+        from huggingface_hub.utils._http import UniqueRequestIdAdapter as Adapter
+    except ImportError:
+        from requests.adapters import HTTPAdapter as Adapter
+
+    adapter = Adapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
+    def backend_factory() -> requests.Session:
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    configure_http_backend(backend_factory=backend_factory)
@@ -0,0 +1,145 @@
+"""
+Process-wide registry of lazily loaded models.
+
+Modules ask the registry for their spaCy pipelines and Sentence-BERT models
+instead of loading them directly, so a service that runs several modules in
+one process loads each model once (on first use) and every consumer shares
+the same instance. Load time and resident-memory growth are recorded per model.
+"""
+from typing import Any, Callable, Dict, Iterable, Optional
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process in bytes (0 if it cannot be determined)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS reports bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+class ModelRegistry:
+    """Thread-safe, lazily populated map of model key -> loaded model."""
+
+    def __init__(self):
+        self._models: Dict[str, Any] = {}
+        self._stats: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Return the model registered under key, calling loader() on first use.
+
+        Concurrent first requests for the same key wait for a single load.
+        """
+        with self._lock:
+            if key in self._models:
+                return self._models[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._models:
+                    return self._models[key]
+
+            rss_before = current_rss_bytes()
+            start = time.perf_counter()
+            model = loader()
+            load_seconds = time.perf_counter() - start
+            rss_delta_mb = max(current_rss_bytes() - rss_before, 0) / (1024 * 1024)
+
+            with self._lock:
+                self._models[key] = model
+                self._stats[key] = {
+                    "load_seconds": round(load_seconds, 3),
+                    "rss_delta_mb": round(rss_delta_mb, 1),
+                }
+            logger.info(f"✓ Loaded {key} in {load_seconds:.2f}s (+{rss_delta_mb:.0f} MB RSS)")
+            return model
+
+    def is_loaded(self, key: str) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Load time (seconds) and RSS growth (MB) per loaded model.
+
+        RSS growth is measured around each load, so it is approximate when
+        different models load concurrently.
+        """
+        with self._lock:
+            return {key: dict(stats) for key, stats in self._stats.items()}
+
+    def clear(self):
+        """Drop every loaded model (mainly for tests and reloads)."""
+        with self._lock:
+            self._models.clear()
+            self._stats.clear()
+            self._key_locks.clear()
+
+
+# Global registry instance
+registry = ModelRegistry()
+
+
+def get_spacy_model(name: str, exclude: Optional[Iterable[str]] = None):
+    """Shared spaCy pipeline loaded with spacy.load(name, exclude=...)."""
+    exclude = sorted(exclude or [])
+    key = f"spacy:{name}" + (f"[-{','.join(exclude)}]" if exclude else "")
+
+    def load():
+        import spacy
+        return spacy.load(name, exclude=exclude)
+
+    return registry.get(key, load)
+
+
+def get_blank_spacy(lang: str = "en", pipes: Iterable[str] = ("sentencizer",)):
+    """Shared blank spaCy pipeline with only the given rule-based components."""
+    pipes = list(pipes)
+    key = f"spacy-blank:{lang}[{','.join(pipes)}]"
+
+    def load():
+        import spacy
+        nlp = spacy.blank(lang)
+        for pipe in pipes:
+            nlp.add_pipe(pipe)
+        return nlp
+
+    return registry.get(key, load)
+
+
+def get_sentence_transformer(name: str, quantize: bool = False):
+    """
+    Shared Sentence-BERT model.
+
+    With quantize=True the model runs on CPU with its Linear layers converted to
+    int8 by PyTorch dynamic quantization (smaller and faster, slightly less exact).
+    """
+    def load():
+        from sentence_transformers import SentenceTransformer
+        if not quantize:
+            return SentenceTransformer(name)
+
+        import torch
+        model = SentenceTransformer(name, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    key = f"sentence-transformer:{name}" + ("[int8]" if quantize else "")
+    return registry.get(key, load)
@@ -26,14 +26,27 @@ class ValidationMetrics:
     difficulty_change: Optional[float] = None
     semantic_pass: bool = False
     difficulty_pass: bool = False
+    rejection_reasons: Optional[list] = None  # Pre-validation gate rejections, per attempt
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             'semantic_similarity': self.semantic_similarity,
             'difficulty_change': self.difficulty_change,
             'semantic_pass': self.semantic_pass,
-            'difficulty_pass': self.difficulty_pass
+            'difficulty_pass': self.difficulty_pass,
+            'rejection_reasons': self.rejection_reasons or []
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ValidationMetrics":
+        """Rebuild metrics from to_dict() output."""
+        return cls(
+            semantic_similarity=data.get('semantic_similarity'),
+            difficulty_change=data.get('difficulty_change'),
+            semantic_pass=data.get('semantic_pass', False),
+            difficulty_pass=data.get('difficulty_pass', False),
+            rejection_reasons=data.get('rejection_reasons')
+        )
 
 @dataclass
 class ConversionResult:
@@ -53,6 +66,7 @@ class ConversionResult:
     error_message: Optional[str] = None
     warnings: Optional[list] = None
     file_path: Optional[str] = None  # Path to saved output file
+    item_id: Optional[str] = None  # ID of the AssessmentItem this result belongs to
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -65,9 +79,26 @@ class ConversionResult:
             'iterations_taken': self.iterations_taken,
             'error_message': self.error_message,
             'warnings': self.warnings or [],
-            'file_path': self.file_path
+            'file_path': self.file_path,
+            'item_id': self.item_id
         }
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversionResult":
+        """Rebuild a result from to_dict() output (e.g. a checkpoint record)."""
+        return cls(
+            status=ConversionStatus(data['status']),
+            format_type=FormatType(data['format_type']),
+            original_text=data['original_text'],
+            converted_content=data['converted_content'],
+            metrics=ValidationMetrics.from_dict(data.get('metrics') or {}),
+            iterations_taken=data['iterations_taken'],
+            error_message=data.get('error_message'),
+            warnings=data.get('warnings'),
+            file_path=data.get('file_path'),
+            item_id=data.get('item_id')
+        )
+    
     @property
     def is_validated(self) -> bool:
         """Check if conversion passed validation."""
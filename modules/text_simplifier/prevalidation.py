@@ -0,0 +1,131 @@
+"""
+Cheap rule-based gate that rejects obviously bad candidates before the
+(much more expensive) embedding and difficulty validators run.
+"""
+from config import config
+from typing import List, Optional
+import re
+
+# A whitespace-separated token is "math" if it contains a digit, a super/subscript
+# or a math symbol, is a bare operator, or looks like function notation such as f(x).
+MATH_CHARS = re.compile(r"[0-9⁰¹²³⁴⁵⁶⁷⁸⁹₀₁₂₃₄₅₆₇₈₉=+×÷*/^<>≤≥≠≈√π∑∫∞%]")
+FUNCTION_NOTATION = re.compile(r"[A-Za-z]\w*\([^()\s]*\)")
+BARE_OPERATORS = {"-", "−", "–"}
+TRAILING_PUNCTUATION = ".,;:?!"
+WORD_CHARS = re.compile(r"\w+")
+
+# Commentary starting on a new line after the question breaks the
+# "only the simplified question" contract of the prompt.
+CONTRACT_BREAK = re.compile(
+    r"\n\s*[*_(]*(?:(?:explanation|notes?|changes(?: made)?|rationale)\s*[*_]*:|"
+    r"i (?:simplified|changed|replaced|kept|removed|used)\b|this (?:version|simplified)\b)",
+    re.IGNORECASE
+)
+
+
+def stream_abort_reason(original: str, partial: str, max_length_ratio: Optional[float] = None) -> Optional[str]:
+    """
+    Decide whether a streamed generation can be abandoned early.
+
+    Output longer than the gate's length bound would be rejected anyway, and
+    commentary after the question means the model ignored the output contract.
+
+    Args:
+        original: Original question text
+        partial: Output received so far
+        max_length_ratio: Length bound as a multiple of the original (defaults to
+            config.PREVALIDATION_MAX_LENGTH_RATIO)
+
+    Returns:
+        Reason for aborting, or None to keep streaming
+    """
+    max_length_ratio = max_length_ratio or config.PREVALIDATION_MAX_LENGTH_RATIO
+    max_chars = max_length_ratio * max(len(original.strip()), 1)
+    if len(partial.strip()) > max_chars:
+        return f"output exceeds {max_length_ratio}x the original length"
+    if partial.strip() and CONTRACT_BREAK.search(partial.lstrip()):
+        return "output continues past the simplified question"
+    return None
+
+
+class PreValidationGate:
+    """Rejects empty, echoed, badly sized or math-dropping candidates in microseconds."""
+
+    def __init__(
+        self,
+        max_length_ratio: Optional[float] = None,
+        min_length_ratio: Optional[float] = None
+    ):
+        """
+        Args:
+            max_length_ratio: Reject candidates longer than this multiple of the original
+            min_length_ratio: Reject candidates shorter than this fraction of the original
+        """
+        self.max_length_ratio = max_length_ratio or config.PREVALIDATION_MAX_LENGTH_RATIO
+        self.min_length_ratio = min_length_ratio or config.PREVALIDATION_MIN_LENGTH_RATIO
+
+    def check(self, original: str, candidate: str, preserve_math: bool = True) -> List[str]:
+        """
+        Run every rule against a candidate.
+
+        Returns:
+            List of human-readable rejection reasons (empty if the candidate passes)
+        """
+        if not candidate or not candidate.strip():
+            return ["empty output"]
+
+        reasons = []
+
+        if self._normalize(candidate) == self._normalize(original):
+            reasons.append("output echoes the original")
+
+        ratio = len(candidate.strip()) / max(len(original.strip()), 1)
+        if ratio > self.max_length_ratio:
+            reasons.append(f"length ratio {ratio:.2f} above {self.max_length_ratio}")
+        elif ratio < self.min_length_ratio:
+            reasons.append(f"length ratio {ratio:.2f} below {self.min_length_ratio}")
+
+        if preserve_math:
+            compact_candidate = "".join(candidate.split())
+            missing = [
+                expr for expr in self.extract_math_expressions(original)
+                if expr not in compact_candidate
+            ]
+            if missing:
+                reasons.append(f"math notation missing: {', '.join(missing)}")
+
+        return reasons
+
+    @staticmethod
+    def extract_math_expressions(text: str) -> List[str]:
+        """
+        Return each run of consecutive math tokens with whitespace removed,
+        e.g. "f(x) = 3x² + 5x - 2" -> "f(x)=3x²+5x-2".
+        """
+        expressions = []
+        current = []
+        for token in text.split():
+            stripped = token.rstrip(TRAILING_PUNCTUATION) or token
+            is_math = (
+                MATH_CHARS.search(stripped) is not None
+                or FUNCTION_NOTATION.fullmatch(stripped) is not None
+                or stripped in BARE_OPERATORS
+            )
+            if is_math:
+                current.append(stripped)
+                if stripped != token:
+                    # Sentence punctuation ends the expression
+                    expressions.append("".join(current))
+                    current = []
+            elif current:
+                expressions.append("".join(current))
+                current = []
+        if current:
+            expressions.append("".join(current))
+
+        # A lone operator (e.g. a dash used as punctuation) is not worth checking
+        return [expr for expr in expressions if expr not in BARE_OPERATORS]
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return " ".join(WORD_CHARS.findall(text.lower()))
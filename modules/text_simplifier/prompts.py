@@ -1,3 +1,13 @@
+import re
+
+# Instruction for each simplification level, shared by the single- and multi-level prompts
+DIFFICULTY_GUIDANCE = {
+    "minimal": "Make only minor word substitutions.",
+    "moderate": "Use simpler words and shorter sentences.",
+    "significant": "Use very basic vocabulary and very short sentences."
+}
+
+
 class SimplificationPrompts:
     """Prompt templates for controlled text simplification."""
     
@@ -9,12 +19,6 @@ class SimplificationPrompts:
         if preserve_math:
             math_instruction = "Keep ALL math notation, formulas, and equations EXACTLY as written."
         
-        difficulty_guidance = {
-            "minimal": "Make only minor word substitutions.",
-            "moderate": "Use simpler words and shorter sentences.",
-            "significant": "Use very basic vocabulary and very short sentences."
-        }
-        
         prompt = f"""Simplify this assessment question for students with reading difficulties.
 
 RULES:
@@ -22,10 +26,58 @@ RULES:
 - Only simplify the LANGUAGE, not the concept difficulty
 {math_instruction}
 
-LEVEL: {difficulty_guidance[target_level]}
+LEVEL: {DIFFICULTY_GUIDANCE[target_level]}
 
 QUESTION: {question}
 
 Provide only the simplified question:"""
         
         return prompt
+
+    @staticmethod
+    def get_multilevel_prompt(question, levels=("minimal", "moderate", "significant"), preserve_math=True):
+        """Generate one prompt asking for several simplification levels at once."""
+        
+        math_instruction = ""
+        if preserve_math:
+            math_instruction = "Keep ALL math notation, formulas, and equations EXACTLY as written in every version."
+        
+        level_lines = "\n".join(f"- {level.upper()}: {DIFFICULTY_GUIDANCE[level]}" for level in levels)
+        format_lines = "\n".join(f"{level.upper()}: <simplified question>" for level in levels)
+        
+        prompt = f"""Simplify this assessment question for students with reading difficulties, once for each level below.
+
+RULES:
+- Every version must test the SAME knowledge
+- Only simplify the LANGUAGE, not the concept difficulty
+{math_instruction}
+
+LEVELS:
+{level_lines}
+
+QUESTION: {question}
+
+Answer in exactly this format, with nothing else:
+{format_lines}"""
+        
+        return prompt
+    
+    @staticmethod
+    def parse_multilevel_response(response, levels=("minimal", "moderate", "significant")):
+        """
+        Split a response to get_multilevel_prompt() into {level: simplified_text}.
+        
+        Levels that are missing or empty in the response are left out.
+        """
+        labels = "|".join(re.escape(level.upper()) for level in levels)
+        pattern = re.compile(rf"^[\s*#-]*({labels})[\s*]*:[\s*]*", re.IGNORECASE | re.MULTILINE)
+        
+        matches = list(pattern.finditer(response))
+        parsed = {}
+        for match, following in zip(matches, matches[1:] + [None]):
+            end = following.start() if following else len(response)
+            text = response[match.end():end].strip()
+            level = match.group(1).lower()
+            if text and level not in parsed:
+                parsed[level] = text
+        return parsed
@@ -0,0 +1,109 @@
+"""
+Single-pass readability metrics.
+
+Every metric is computed from one spaCy Doc plus one word split of its text,
+instead of one textstat pass per formula plus one for spaCy. Per-word
+syllable counts are memoized in a bounded LRU cache since assessment
+vocabulary repeats heavily across items.
+
+The Flesch scores reproduce textstat exactly (same word split, sentence
+rule and rounding), so they match the values the original scorer produced;
+average word and sentence length come from the spaCy tokens as before.
+"""
+from config import config
+from functools import lru_cache
+from typing import Iterable, List
+import math
+import pyphen
+import re
+
+_hyphenator = pyphen.Pyphen(lang="en_US")
+
+# textstat's rules: punctuation is deleted before splitting on whitespace, and
+# "sentences" of two words or fewer (e.g. "A) 4", "Q1.") are not counted
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_SENTENCE = re.compile(r"\b[^.!?]+[.!?]*")
+_MIN_SENTENCE_WORDS = 3
+
+
+@lru_cache(maxsize=config.SYLLABLE_CACHE_SIZE)
+def count_syllables(word: str) -> int:
+    """Syllables in a lowercase word (pyphen hyphenation points + 1, as textstat does)."""
+    return len(_hyphenator.positions(word)) + 1
+
+
+def legacy_round(number: float, points: int = 0) -> float:
+    """Round half away from zero, as textstat does for its outputs."""
+    p = 10 ** points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
+
+def _words(text: str) -> List[str]:
+    return _PUNCTUATION.sub("", text).split()
+
+
+def _count_sentences(text: str) -> int:
+    sentences = _SENTENCE.findall(text)
+    return max(1, sum(1 for sentence in sentences if len(_words(sentence)) >= _MIN_SENTENCE_WORDS))
+
+
+class ReadabilityEngine:
+    """Computes Flesch scores (regex word split) and length statistics (spaCy tokens)."""
+
+    def analyze_doc(self, doc) -> dict:
+        """
+        Compute every readability metric from a spaCy Doc.
+
+        Returns:
+            dict with num_words, num_sentences, num_syllables, avg_word_length,
+            avg_sentence_length, avg_syllables_per_word, flesch_reading_ease
+            and flesch_kincaid_grade
+        """
+        # Flesch inputs: textstat's word split, so tokens such as "+", "=" or
+        # "2/5" pieces without letters or digits never count as words
+        words = _words(doc.text.lower())
+        num_syllables = sum(count_syllables(word) for word in words)
+        num_sentences = _count_sentences(doc.text)
+
+        # Length statistics: spaCy tokens that are not punctuation
+        num_tokens = 0
+        num_chars = 0
+        for token in doc:
+            if token.is_punct:
+                continue
+            num_tokens += 1
+            num_chars += len(token.text)
+        num_doc_sentences = max(sum(1 for _ in doc.sents), 1)
+
+        return self._metrics(
+            len(words), num_syllables, num_sentences,
+            num_tokens, num_chars, num_doc_sentences,
+        )
+
+    def analyze_docs(self, docs: Iterable) -> List[dict]:
+        """Batch variant of analyze_doc() (pair with nlp.pipe for streaming)."""
+        return [self.analyze_doc(doc) for doc in docs]
+
+    @staticmethod
+    def _metrics(num_words: int, num_syllables: int, num_sentences: int,
+                 num_tokens: int, num_chars: int, num_doc_sentences: int) -> dict:
+        words_per_sentence = legacy_round(num_words / num_sentences, 1)
+        avg_syllables_per_word = legacy_round(num_syllables / num_words, 1) if num_words else 0.0
+
+        flesch_reading_ease = legacy_round(
+            206.835 - 1.015 * words_per_sentence - 84.6 * avg_syllables_per_word, 2
+        )
+        flesch_kincaid_grade = legacy_round(
+            0.39 * words_per_sentence + 11.8 * avg_syllables_per_word - 15.59, 1
+        )
+
+        return {
+            "num_words": num_words,
+            "num_sentences": num_sentences,
+            "num_syllables": num_syllables,
+            "avg_word_length": num_chars / max(num_tokens, 1),
+            "avg_sentence_length": num_tokens / num_doc_sentences,
+            "avg_syllables_per_word": avg_syllables_per_word,
+            "flesch_reading_ease": flesch_reading_ease,
+            "flesch_kincaid_grade": flesch_kincaid_grade,
+        }
@@ -0,0 +1,140 @@
+"""
+Bulk re-validation of stored simplifications without any LLM calls.
+
+When SEMANTIC_THRESHOLD or DIFFICULTY_THRESHOLD change, past results can be
+re-classified by recomputing their metrics in large batches: embeddings are
+encoded in bulk, all cosine similarities come from one row-wise matrix product
+per chunk, and difficulty is scored through nlp.pipe (each distinct text once).
+"""
+from semantic_checker import SemanticChecker
+from difficulty_scorer import DifficultyScorer
+from prevalidation import PreValidationGate
+from models import ConversionResult, ConversionStatus, ValidationMetrics
+from config import config
+from dataclasses import replace
+from typing import Iterable, List, Optional, Tuple
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class Revalidator:
+    """Re-scores (original, simplified) pairs and re-classifies stored results."""
+
+    def __init__(
+        self,
+        semantic_checker: Optional[SemanticChecker] = None,
+        difficulty_scorer: Optional[DifficultyScorer] = None,
+        semantic_threshold: Optional[float] = None,
+        difficulty_threshold: Optional[float] = None,
+        chunk_size: int = 4096
+    ):
+        """
+        Args:
+            semantic_checker: Reused if given (e.g. simplifier.semantic_checker)
+            difficulty_scorer: Reused if given (e.g. simplifier.difficulty_scorer)
+            semantic_threshold: New semantic threshold (defaults to config)
+            difficulty_threshold: New difficulty threshold (defaults to config)
+            chunk_size: Pairs processed per chunk, bounding peak memory
+        """
+        self.semantic_checker = semantic_checker or SemanticChecker()
+        self.difficulty_scorer = difficulty_scorer or DifficultyScorer()
+        self.semantic_threshold = (
+            config.SEMANTIC_THRESHOLD if semantic_threshold is None else semantic_threshold
+        )
+        self.difficulty_threshold = (
+            config.DIFFICULTY_THRESHOLD if difficulty_threshold is None else difficulty_threshold
+        )
+        self.chunk_size = chunk_size
+        self.prevalidation_gate = PreValidationGate() if config.PREVALIDATION_ENABLED else None
+
+    def score_pairs(
+        self,
+        pairs: List[Tuple[str, str]],
+        preserve_math: bool = True
+    ) -> List[ValidationMetrics]:
+        """
+        Compute validation metrics for (original, simplified) pairs.
+
+        Pairs rejected by the pre-validation gate keep empty scores and record
+        their rejection reasons, exactly as in the live pipeline.
+        """
+        metrics = []
+        for start in range(0, len(pairs), self.chunk_size):
+            chunk = pairs[start:start + self.chunk_size]
+            metrics.extend(self._score_chunk(chunk, preserve_math))
+            logger.info(f"Re-validated {start + len(chunk)}/{len(pairs)} pairs")
+        return metrics
+
+    def revalidate_results(
+        self,
+        results: Iterable[ConversionResult],
+        preserve_math: bool = True
+    ) -> List[ConversionResult]:
+        """
+        Return copies of results with recomputed metrics and VALIDATED/FLAGGED status.
+
+        FAILED results (nothing was generated) are returned unchanged.
+        """
+        results = list(results)
+        scorable = [
+            i for i, result in enumerate(results)
+            if result.status != ConversionStatus.FAILED and result.converted_content
+        ]
+        metrics = self.score_pairs(
+            [(results[i].original_text, results[i].converted_content) for i in scorable],
+            preserve_math
+        )
+
+        updated = list(results)
+        for i, new_metrics in zip(scorable, metrics):
+            passed = new_metrics.semantic_pass and new_metrics.difficulty_pass
+            updated[i] = replace(
+                results[i],
+                status=ConversionStatus.VALIDATED if passed else ConversionStatus.FLAGGED,
+                metrics=new_metrics,
+                warnings=[] if passed else ["Failed validation checks"]
+            )
+        return updated
+
+    def _score_chunk(self, pairs: List[Tuple[str, str]], preserve_math: bool) -> List[ValidationMetrics]:
+        rejections = [
+            self.prevalidation_gate.check(original, simplified, preserve_math)
+            if self.prevalidation_gate else []
+            for original, simplified in pairs
+        ]
+        accepted = [i for i, reasons in enumerate(rejections) if not reasons]
+
+        metrics = [ValidationMetrics(rejection_reasons=reasons) for reasons in rejections]
+        if not accepted:
+            return metrics
+
+        originals = [pairs[i][0] for i in accepted]
+        simplified = [pairs[i][1] for i in accepted]
+
+        # One matrix operation for every cosine similarity in the chunk
+        original_matrix = self.semantic_checker.encode_matrix(originals)
+        simplified_matrix = self.semantic_checker.encode_matrix(simplified)
+        similarities = np.einsum("ij,ij->i", original_matrix, simplified_matrix)
+
+        # Score each distinct text once (originals repeat across levels and reruns)
+        distinct_texts = list(dict.fromkeys(originals + simplified))
+        composite = {
+            text: scores["composite_difficulty"]
+            for text, scores in zip(distinct_texts, self.difficulty_scorer.score_many(distinct_texts))
+        }
+
+        for i, similarity, original, simple in zip(accepted, similarities, originals, simplified):
+            semantic_score = float(similarity)
+            difficulty_change = self.difficulty_scorer.relative_change(
+                composite[original], composite[simple]
+            )
+            metrics[i] = ValidationMetrics(
+                semantic_similarity=semantic_score,
+                difficulty_change=difficulty_change,
+                semantic_pass=semantic_score >= self.semantic_threshold,
+                difficulty_pass=difficulty_change <= self.difficulty_threshold,
+                rejection_reasons=[]
+            )
+        return metrics
@@ -1,16 +1,155 @@
-from sentence_transformers import SentenceTransformer
+from model_registry import get_sentence_transformer
+from collections import OrderedDict
+from config import config
+from typing import List, Optional
 import numpy as np
+import hashlib
+import os
+import threading
 
 class SemanticChecker:
-    def __init__(self):
-        print("Loading Sentence-BERT model...")
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        print("✓ Model loaded!")
-    
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        cache_size: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        quantize: Optional[bool] = None
+    ):
+        """
+        Args:
+            model_name: Sentence-BERT model (defaults to config.EMBEDDING_MODEL)
+            cache_size: Max embeddings kept in the in-memory LRU cache (0 disables it)
+            cache_dir: Optional directory for a persistent on-disk embedding store
+            quantize: Use the int8 dynamically quantized CPU model (defaults to
+                config.EMBEDDING_QUANTIZE); see calibration.py before enabling
+        """
+        self.model_name = model_name or config.EMBEDDING_MODEL
+        self.quantize = config.EMBEDDING_QUANTIZE if quantize is None else quantize
+        # Shared with every other consumer in this process
+        self.model = get_sentence_transformer(self.model_name, quantize=self.quantize)
+
+        self.cache_size = config.EMBEDDING_CACHE_SIZE if cache_size is None else cache_size
+        self.cache_dir = cache_dir if cache_dir is not None else config.EMBEDDING_CACHE_DIR
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def check_similarity(self, text1, text2):
         """Calculate semantic similarity between two texts (0-1 scale)."""
-        embeddings = self.model.encode([text1, text2])
-        similarity = np.dot(embeddings[0], embeddings[1]) / (
-            np.linalg.norm(embeddings[0]) * np.linalg.norm(embeddings[1])
+        embeddings = self.embed_many([text1, text2])
+        return self._cosine(embeddings[0], embeddings[1])
+
+    def embed(self, text: str) -> np.ndarray:
+        """Return the (cached) embedding for a single text."""
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: List[str], use_cache: bool = True) -> List[np.ndarray]:
+        """
+        Return embeddings for many texts, encoding only cache misses in one batch.
+
+        Pass use_cache=False for one-off texts (e.g. LLM candidates) so they do
+        not evict frequently reused originals from the cache.
+        """
+        if not use_cache:
+            return list(self.model.encode(list(texts)))
+
+        keys = [self._key(text) for text in texts]
+        embeddings = [self._lookup(key) for key in keys]
+
+        missing = [i for i, emb in enumerate(embeddings) if emb is None]
+        if missing:
+            encoded = self.model.encode([texts[i] for i in missing])
+            for i, emb in zip(missing, encoded):
+                embeddings[i] = emb
+                self._store(keys[i], emb)
+
+        with self._lock:
+            self.cache_hits += len(texts) - len(missing)
+            self.cache_misses += len(missing)
+        return embeddings
+
+    def compare_to_anchor(self, anchor: np.ndarray, candidates: List[str]) -> List[float]:
+        """
+        Compare a stored anchor embedding (see embed()) against new candidate texts.
+
+        Only the candidates are encoded, so the anchor text is never re-encoded
+        across regeneration attempts.
+        """
+        if not candidates:
+            return []
+        embeddings = self.embed_many(candidates, use_cache=False)
+        return [self._cosine(anchor, emb) for emb in embeddings]
+
+    def encode_matrix(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Encode texts into an (n, dim) matrix of L2-normalized embeddings, so
+        row-wise dot products are cosine similarities. Bypasses the cache; meant
+        for bulk jobs over many distinct texts.
+        """
+        embeddings = np.asarray(
+            self.model.encode(list(texts), batch_size=batch_size or config.EMBEDDING_BATCH_SIZE),
+            dtype=np.float32
+        )
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def cache_info(self) -> dict:
+        """Hit/miss counters and current size of the in-memory cache."""
+        with self._lock:
+            return {
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+            }
+
+    @staticmethod
+    def _cosine(emb1, emb2) -> float:
+        similarity = np.dot(emb1, emb2) / (
+            np.linalg.norm(emb1) * np.linalg.norm(emb2)
         )
         return float(similarity)
+
+    def _key(self, text: str) -> str:
+        """Content hash of the text, scoped to the embedding model and precision."""
+        model_id = f"{self.model_name}[int8]" if self.quantize else self.model_name
+        return hashlib.sha256(f"{model_id}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"{key}.npy")
+            if os.path.exists(path):
+                try:
+                    emb = np.load(path)
+                except (OSError, ValueError):
+                    return None
+                self._remember(key, emb)
+                return emb
+        return None
+
+    def _store(self, key: str, emb: np.ndarray):
+        self._remember(key, emb)
+        if self.cache_dir:
+            path = os.path.join(self.cache_dir, f"{key}.npy")
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, emb)
+            os.replace(tmp_path, path)
+
+    def _remember(self, key: str, emb: np.ndarray):
+        if self.cache_size <= 0:
+            return
+        with self._lock:
+            self._cache[key] = emb
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
@@ -0,0 +1,86 @@
+"""Exploration, batched saving and response-cache handling of attempts."""
+import json
+import random
+import threading
+import time
+
+import pytest
+
+from attempt_policy import AttemptPolicy
+from prompts import SimplificationPrompts
+from response_cache import ResponseCache
+from text_simplifier import DeadlineExceeded, TextSimplifier
+
+
+def trained_policy(**kwargs):
+    """Step 0 always passes, step 2 never does (so it is dropped)."""
+    policy = AttemptPolicy(min_samples=10, min_pass_rate=0.2, max_attempts=3, **kwargs)
+    for _ in range(20):
+        policy.record("k", 0, True)
+        policy.record("k", 1, False)
+        policy.record("k", 2, False)
+    return policy
+
+
+def test_without_exploration_dropped_steps_never_return():
+    policy = trained_policy(explore_rate=0.0)
+    assert all(policy.plan("k") == [0] for _ in range(100))
+
+
+def test_exploration_sometimes_leads_with_a_dropped_step():
+    policy = trained_policy(explore_rate=0.2, rng=random.Random(1))
+    plans = [policy.plan("k") for _ in range(500)]
+    explored = [plan for plan in plans if plan[0] != 0]
+    assert 50 < len(explored) < 150
+    assert [2, 0] in explored and [1, 0] in explored
+    assert policy.report()["k"]["schedule"] == [0]
+
+
+def test_saves_in_batches_and_on_flush(tmp_path):
+    path = str(tmp_path / "policy.json")
+    policy = AttemptPolicy(path, save_every=3)
+    for step in range(2):
+        policy.record("k", step, True)
+        policy.save_if_due()
+    assert not (tmp_path / "policy.json").exists()
+
+    policy.record("k", 2, False)
+    policy.save_if_due()
+    with open(path) as f:
+        assert json.load(f)["k"]["2"] == {"tries": 1, "passes": 0}
+
+    policy.record("k", 2, True)
+    policy.flush()
+    assert AttemptPolicy(path)._stats["k"]["2"] == {"tries": 2, "passes": 1}
+
+
+def cached_simplifier(request_completion):
+    simplifier = TextSimplifier.__new__(TextSimplifier)
+    simplifier._local = threading.local()
+    simplifier.prompts = SimplificationPrompts()
+    simplifier.base_temperature, simplifier.temperature_increment = 0.3, 0.1
+    simplifier.response_cache = ResponseCache(":memory:")
+    simplifier.bypass_cache = False
+    simplifier._request_completion = request_completion
+    return simplifier
+
+
+def test_generate_reports_cache_hits():
+    simplifier = cached_simplifier(lambda *request: "A simpler question.")
+
+    args = ("Determine the value of x.", "moderate", True, 1, None, 0)
+    assert simplifier._generate(*args) == ("A simpler question.", False)
+    assert simplifier._generate(*args) == ("A simpler question.", True)
+
+
+def test_response_arriving_after_the_deadline_is_cached():
+    def late(*request, cancel_event=None):
+        time.sleep(0.3)
+        return "A simpler question."
+
+    simplifier = cached_simplifier(late)
+    args = ("Determine the value of x.", "moderate", True, 1)
+    with pytest.raises(DeadlineExceeded):
+        simplifier._generate(*args, time.monotonic() + 0.1, 0)
+    time.sleep(0.4)
+    assert simplifier._generate(*args, None, 0) == ("A simpler question.", True)
@@ -0,0 +1,109 @@
+"""SingleFlight and its use in TextSimplifier.convert with deadlines."""
+import threading
+import time
+
+import pytest
+
+from coalescing import SingleFlight
+from models import AssessmentItem, ConversionStatus
+from text_simplifier import TextSimplifier
+
+
+def slow(seconds, value="done"):
+    def work():
+        time.sleep(seconds)
+        return value
+    return work
+
+
+def run_in_thread(fn):
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.setdefault("value", fn()), daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+def test_followers_share_the_leader_result():
+    flight = SingleFlight()
+    leader, outcome = run_in_thread(lambda: flight.do("k", slow(0.2)))
+    time.sleep(0.05)
+    assert flight.do("k", slow(0, "other")) == ("done", True)
+    leader.join()
+    assert outcome["value"] == ("done", False)
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 1}
+
+
+def test_follower_stops_waiting_at_its_timeout():
+    flight = SingleFlight()
+    leader, _ = run_in_thread(lambda: flight.do("k", slow(0.5)))
+    time.sleep(0.05)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        flight.do("k", slow(0), timeout=0.1)
+    assert time.monotonic() - start < 0.3
+    leader.join()
+
+
+def bare_simplifier(work):
+    """A TextSimplifier without models whose generation is `work`."""
+    simplifier = TextSimplifier.__new__(TextSimplifier)
+    simplifier.single_flight = SingleFlight()
+    simplifier.max_attempts = 3
+    simplifier._simplify_with_validation = lambda text, level, preserve_math, deadline_at: work(deadline_at)
+    return simplifier
+
+
+def passing_result(text="Find x."):
+    return {
+        "simplified_text": text, "semantic_score": 0.9, "semantic_pass": True,
+        "difficulty_change": 1.0, "difficulty_pass": True, "attempt": 1,
+        "success": True, "flagged": False, "rejection_reasons": [], "timed_out": False,
+    }
+
+
+def test_convert_follower_honours_its_deadline():
+    simplifier = bare_simplifier(lambda deadline_at: (time.sleep(0.6), passing_result())[1])
+    item = AssessmentItem(id="Q1", text="Determine x.")
+
+    leader, _ = run_in_thread(lambda: simplifier.convert(item, deadline=0))
+    time.sleep(0.05)
+    start = time.monotonic()
+    result = simplifier.convert(item, deadline=0.1)
+    assert time.monotonic() - start < 0.4
+    assert result.status == ConversionStatus.FAILED
+    leader.join()
+
+
+def leader_times_out_first(calls):
+    def work(deadline_at):
+        calls.append(deadline_at)
+        if len(calls) == 1:
+            time.sleep(0.2)
+            return dict(passing_result(), success=False, flagged=True, timed_out=True)
+        return passing_result()
+    return work
+
+
+def test_convert_reruns_when_leader_ran_out_of_time():
+    calls = []
+
+    simplifier = bare_simplifier(leader_times_out_first(calls))
+    item = AssessmentItem(id="Q1", text="Determine x.")
+    leader, _ = run_in_thread(lambda: simplifier.convert(item, deadline=0.2))
+    time.sleep(0.05)
+    result = simplifier.convert(item, deadline=5)
+    leader.join()
+    assert result.status == ConversionStatus.VALIDATED
+    assert len(calls) == 2
+
+
+def test_convert_without_deadline_reruns_when_leader_ran_out_of_time():
+    calls = []
+    simplifier = bare_simplifier(leader_times_out_first(calls))
+    item = AssessmentItem(id="Q1", text="Determine x.")
+    leader, _ = run_in_thread(lambda: simplifier.convert(item, deadline=0.2))
+    time.sleep(0.05)
+    result = simplifier.convert(item, deadline=0)
+    leader.join()
+    assert result.status == ConversionStatus.VALIDATED
+    assert calls == [calls[0], None]
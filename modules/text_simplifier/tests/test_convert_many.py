@@ -0,0 +1,42 @@
+"""aconvert_many must not block the event loop when its consumer stops early."""
+import asyncio
+import time
+
+from models import AssessmentItem
+from text_simplifier import TextSimplifier
+
+
+def slow_simplifier(seconds):
+    simplifier = TextSimplifier.__new__(TextSimplifier)
+    simplifier.attempt_policy = None
+    simplifier._convert_safe = lambda item, *args: (time.sleep(seconds * (item.id != "fast")), item.id)[1]
+    return simplifier
+
+
+def test_breaking_out_of_aconvert_many_does_not_stall_the_loop():
+    simplifier = slow_simplifier(1.0)
+    items = [AssessmentItem(id="fast", text="x")] + [AssessmentItem(id=f"Q{i}", text="x") for i in range(3)]
+    gaps = []
+
+    async def heartbeat():
+        last = time.monotonic()
+        for _ in range(10):
+            await asyncio.sleep(0.05)
+            now = time.monotonic()
+            gaps.append(now - last)
+            last = now
+
+    async def consume():
+        stream = simplifier.aconvert_many(items, concurrency=4)
+        async for item_id in stream:
+            assert item_id == "fast"
+            break
+        await stream.aclose()
+
+    async def main():
+        beat = asyncio.create_task(heartbeat())
+        await consume()
+        await beat
+
+    asyncio.run(main())
+    assert max(gaps) < 0.5
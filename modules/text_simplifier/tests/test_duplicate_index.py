@@ -0,0 +1,81 @@
+"""Persistence and crash recovery of NearDuplicateIndex."""
+import json
+import os
+
+import numpy as np
+
+from duplicate_index import NearDuplicateIndex, adapt_simplification
+
+
+def vector(seed, dim=8):
+    return np.random.default_rng(seed).normal(size=dim).astype(np.float32)
+
+
+def fill(index, count, start=0):
+    for i in range(start, start + count):
+        index.add(f"Question {i}", vector(i), f"Simple {i}", "moderate", True)
+
+
+def lines(path):
+    with open(os.path.join(path, "entries.jsonl"), encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+def test_reload_keeps_entries_aligned_with_rows(tmp_path):
+    fill(NearDuplicateIndex(str(tmp_path), initial_capacity=2), 5)  # grows twice
+
+    index = NearDuplicateIndex(str(tmp_path))
+    assert len(index) == 5
+    entry, score = index.search(vector(3), "moderate", True, threshold=0.99)
+    assert entry["original"] == "Question 3" and score > 0.99
+
+
+def test_torn_last_line_is_truncated_before_new_writes(tmp_path):
+    fill(NearDuplicateIndex(str(tmp_path)), 3)
+    with open(tmp_path / "entries.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"original": "Quest')  # crash mid-write
+
+    index = NearDuplicateIndex(str(tmp_path))
+    assert len(index) == 3
+    fill(index, 2, start=3)
+    assert [json.loads(line)["original"] for line in lines(str(tmp_path))] == [f"Question {i}" for i in range(5)]
+
+    reloaded = NearDuplicateIndex(str(tmp_path))
+    assert len(reloaded) == 5
+    entry, _ = reloaded.search(vector(4), "moderate", True, threshold=0.99)
+    assert entry["original"] == "Question 4"
+
+
+def test_uncommitted_entry_is_dropped(tmp_path):
+    fill(NearDuplicateIndex(str(tmp_path)), 3)
+    # Entry written but the process died before the row count was committed
+    (tmp_path / "rows.json").write_text(json.dumps({"rows": 2}))
+
+    index = NearDuplicateIndex(str(tmp_path))
+    assert len(index) == 2
+    assert len(lines(str(tmp_path))) == 2
+    assert index.search(vector(2), "moderate", True, threshold=0.99) is None
+
+
+def test_missing_matrix_resets_entries(tmp_path):
+    fill(NearDuplicateIndex(str(tmp_path)), 3)
+    os.remove(tmp_path / "embeddings.npy")
+
+    index = NearDuplicateIndex(str(tmp_path))
+    assert len(index) == 0
+    fill(index, 1, start=7)
+    assert len(lines(str(tmp_path))) == 1
+    assert len(NearDuplicateIndex(str(tmp_path))) == 1
+
+
+def test_adapt_simplification_substitutes_numbers():
+    assert adapt_simplification("Solve 3x + 7 = 22", "Find x: 3x + 7 = 22", "Solve 4x + 9 = 25") == "Find x: 4x + 9 = 25"
+    assert adapt_simplification("Add 2 and 2", "Add 2 + 2", "Add 3 and 4") is None
+
+
+def test_adapt_simplification_rejects_other_wording_changes():
+    simplified = "Find the area of a circle with radius 3 cm."
+    original = "Calculate the area of a circle with a radius of 3 cm."
+    assert adapt_simplification(original, simplified, original.replace("area", "circumference")) is None
+    assert adapt_simplification("Compute 5 + 3", "Work out 5 + 3", "Compute 5 - 3") is None
+    assert adapt_simplification(original, simplified, original.replace("3", "4")) == simplified.replace("3", "4")
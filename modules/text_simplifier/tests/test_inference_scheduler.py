@@ -0,0 +1,198 @@
+"""
+RequestScheduler / TokenBucket against a local HTTP stub server.
+
+The stub answers per path:
+    /ok          200 immediately
+    /slow        200 after 0.2 s
+    /throttled   429 with Retry-After: 0.3 the first time, then 200
+    /unavailable 503 every time
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import time
+
+import pytest
+import requests
+
+from inference_scheduler import RequestCancelled, RequestScheduler, TokenBucket
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        hits = self.server.hit(self.path)
+        if self.path == "/slow":
+            time.sleep(0.2)
+        if self.path == "/throttled" and hits == 1:
+            self._reply(429, {"Retry-After": "0.3"})
+        elif self.path == "/unavailable":
+            self._reply(503)
+        else:
+            self._reply(200)
+
+    def _reply(self, status, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+
+class StubServer(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.hits = {}
+        self.hit_times = []
+        self._lock = threading.Lock()
+
+    def hit(self, path):
+        with self._lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+            self.hit_times.append(time.monotonic())
+            return self.hits[path]
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+@pytest.fixture
+def stub():
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post(url):
+    response = requests.post(url, timeout=5)
+    response.raise_for_status()
+    return response
+
+
+def make_scheduler(**kwargs):
+    options = dict(rate_per_minute=0, max_in_flight=0, max_retries=3, backoff_base=0.01, backoff_max=5.0)
+    options.update(kwargs)
+    return RequestScheduler(**options)
+
+
+def test_retry_after_is_honoured(stub):
+    scheduler = make_scheduler()
+    start = time.monotonic()
+    response = scheduler.call(post, stub.url("/throttled"))
+    elapsed = time.monotonic() - start
+
+    assert response.status_code == 200
+    assert stub.hits["/throttled"] == 2
+    assert elapsed >= 0.3
+    metrics = scheduler.metrics()
+    assert metrics["throttled"] == 1
+    assert metrics["retries"] == 1
+    assert metrics["completed"] == 1
+
+
+def test_server_errors_are_retried_up_to_the_limit(stub):
+    scheduler = make_scheduler(max_retries=2)
+    with pytest.raises(requests.HTTPError) as error:
+        scheduler.call(post, stub.url("/unavailable"))
+
+    assert error.value.response.status_code == 503
+    assert stub.hits["/unavailable"] == 3
+    metrics = scheduler.metrics()
+    assert metrics["retries"] == 2
+    assert metrics["failed"] == 1
+    assert metrics["in_flight"] == 0
+
+
+def test_client_errors_are_not_retried():
+    scheduler = make_scheduler()
+    with pytest.raises(ValueError):
+        scheduler.call(lambda: (_ for _ in ()).throw(ValueError("bad request")))
+    assert scheduler.metrics()["retries"] == 0
+
+
+def test_delayed_response_is_counted_in_latency(stub):
+    scheduler = make_scheduler()
+    scheduler.call(post, stub.url("/ok"))
+    scheduler.call(post, stub.url("/slow"))
+
+    metrics = scheduler.metrics()
+    assert metrics["completed"] == 2
+    assert metrics["latency_max_seconds"] >= 0.2
+    assert 0.1 <= metrics["latency_avg_seconds"] < metrics["latency_max_seconds"]
+
+
+def test_token_bucket_limits_request_rate(stub):
+    scheduler = make_scheduler(rate_per_minute=600, burst=1)  # 10 requests/s
+    for _ in range(6):
+        scheduler.call(post, stub.url("/ok"))
+
+    span = stub.hit_times[-1] - stub.hit_times[0]
+    assert span >= 0.45  # 5 intervals of 0.1 s, minus timer slack
+
+
+def test_token_bucket_allows_burst():
+    bucket = TokenBucket(rate_per_minute=60, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.1
+    assert bucket.available() < 1
+
+
+def test_stream_holds_in_flight_slot_until_closed():
+    scheduler = make_scheduler(max_in_flight=1)
+
+    def open_stream(stream=False):
+        return iter(["a", "b"])
+
+    first = scheduler.call(open_stream, stream=True)
+    assert scheduler.metrics()["in_flight"] == 1
+
+    second_started = threading.Event()
+
+    def second():
+        scheduler.call(open_stream, stream=True).close()
+        second_started.set()
+
+    worker = threading.Thread(target=second, daemon=True)
+    worker.start()
+    assert not second_started.wait(0.2)  # blocked behind the open stream
+
+    assert list(first) == ["a", "b"]  # exhausting the stream frees the slot
+    assert second_started.wait(2)
+    metrics = scheduler.metrics()
+    assert metrics["in_flight"] == 0
+    assert metrics["completed"] == 2
+
+
+def test_cancel_stops_retrying(stub):
+    scheduler = make_scheduler(max_retries=5, backoff_base=1.0)
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()
+    start = time.monotonic()
+    with pytest.raises(RequestCancelled):
+        scheduler.call(post, stub.url("/unavailable"), cancel_event=cancel)
+
+    assert time.monotonic() - start < 1.0
+    assert stub.hits["/unavailable"] <= 2
+    metrics = scheduler.metrics()
+    assert metrics["cancelled"] == 1
+    assert metrics["in_flight"] == 0
+
+
+def test_cancel_while_waiting_for_a_slot():
+    scheduler = make_scheduler(max_in_flight=1)
+    held = scheduler.call(lambda stream=False: iter(["a"]), stream=True)
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    with pytest.raises(RequestCancelled):
+        scheduler.call(lambda: "never sent", cancel_event=cancel)
+    held.close()
+    assert scheduler.call(lambda: "sent") == "sent"  # the cancelled wait did not take the slot
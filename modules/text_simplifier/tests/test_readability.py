@@ -0,0 +1,56 @@
+"""Flesch scores of ReadabilityEngine against values recorded from textstat 0.7.3."""
+import pytest
+import spacy
+
+from benchmark import QUESTION_TEMPLATES
+from readability import ReadabilityEngine
+
+# (flesch_reading_ease, flesch_kincaid_grade) from textstat 0.7.3 for each
+# benchmark template formatted with a=2, b=3
+RECORDED = [
+    (57.27, 8.8),
+    (47.79, 10.3),
+    (96.69, 1.9),
+    (67.76, 6.8),
+    (1.43, 17.8),
+    (45.76, 11.1),
+    (37.3, 12.3),
+    (88.74, 2.9),
+    (54.22, 9.9),
+    (64.71, 8.0),
+]
+
+EDGE_CASES = {
+    "The cat sat on the mat.": (116.15, -1.5),
+    "Simplify: 2 + 3 = ?": (59.97, 5.6),   # "+", "=" and "?" are not words
+    "Q1. A) 4 B) 5": (117.16, -1.9),       # sentences of two words or fewer are not counted
+}
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def scores(nlp, text):
+    metrics = ReadabilityEngine().analyze_doc(nlp(text))
+    return metrics["flesch_reading_ease"], metrics["flesch_kincaid_grade"]
+
+
+@pytest.mark.parametrize("template,expected", list(zip(QUESTION_TEMPLATES, RECORDED)))
+def test_benchmark_templates_match_textstat(nlp, template, expected):
+    assert scores(nlp, template.format(a=2, b=3)) == expected
+
+
+@pytest.mark.parametrize("text,expected", list(EDGE_CASES.items()))
+def test_symbols_and_fragments_match_textstat(nlp, text, expected):
+    assert scores(nlp, text) == expected
+
+
+def test_matches_installed_textstat(nlp):
+    textstat = pytest.importorskip("textstat")
+    for template in QUESTION_TEMPLATES:
+        text = template.format(a=7, b=11)
+        assert scores(nlp, text) == (textstat.flesch_reading_ease(text), textstat.flesch_kincaid_grade(text))
@@ -0,0 +1,91 @@
+"""Failure handling of PreforkWorkerPool, with a stand-in simplifier."""
+import os
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from attempt_policy import AttemptPolicy
+from duplicate_index import NearDuplicateIndex
+from worker_pool import PreforkWorkerPool
+
+
+class EchoSimplifier:
+    """Upper-cases items; "crash" kills the worker, "slow:..." takes a while."""
+
+    response_cache = None
+    duplicate_index = None
+    attempt_policy = None
+    semantic_checker = SimpleNamespace(embed=lambda text: None)
+    difficulty_scorer = SimpleNamespace(calculate_difficulty=lambda text: None)
+
+    def _convert_safe(self, item, simplification_level, preserve_math):
+        if item == "crash":
+            os._exit(3)
+        if item.startswith("slow:"):
+            time.sleep(0.2)
+        return item.upper()
+
+
+class LearningSimplifier(EchoSimplifier):
+    """Adds every item to the duplicate index and records one attempt for it."""
+
+    def __init__(self, path):
+        self.duplicate_index = NearDuplicateIndex(os.path.join(path, "index"))
+        self.attempt_policy = AttemptPolicy(os.path.join(path, "policy.json"), save_every=1000)
+
+    def _convert_safe(self, item, simplification_level, preserve_math):
+        seed = int(item[1:])
+        embedding = np.random.default_rng(seed).normal(size=8).astype(np.float32)
+        self.duplicate_index.add(item, embedding, item.lower(), simplification_level, preserve_math)
+        self.attempt_policy.record("k", seed % 3, True)
+        return item.upper()
+
+
+def make_pool(workers=2, factory=EchoSimplifier):
+    return PreforkWorkerPool(num_workers=workers, simplifier_factory=factory, poll_interval=0.1)
+
+
+def test_map_returns_every_result():
+    with make_pool() as pool:
+        assert sorted(pool.map(["a", "b", "c"])) == ["A", "B", "C"]
+        report = pool.report()
+    assert report["workers_total_rss_mb"] > 0
+    assert "independent_processes_estimate_mb" in report
+
+
+def test_map_raises_when_a_worker_dies():
+    pool = make_pool()
+    pool.start()
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="exit codes"):
+        list(pool.map(["crash", "a"]))
+    assert time.monotonic() - started < 5
+    pool.close()
+    assert pool._processes == []
+
+
+def test_close_discards_results_of_an_abandoned_map():
+    with make_pool() as pool:
+        results = pool.map([f"slow:{i}" for i in range(6)])
+        assert next(results).startswith("SLOW:")
+        # the remaining results are still queued when the pool closes
+    assert all("final" in stats for stats in pool._worker_stats.values())
+
+
+def test_parent_writes_index_additions_and_attempt_outcomes(tmp_path):
+    items = [f"Q{i}" for i in range(12)]
+    with make_pool(workers=3, factory=lambda: LearningSimplifier(str(tmp_path))) as pool:
+        assert sorted(pool.map(items)) == sorted(item.upper() for item in items)
+
+    index = NearDuplicateIndex(str(tmp_path / "index"))
+    assert sorted(entry["original"] for entry in index._entries) == sorted(items)
+    for entry in index._entries:
+        seed = int(entry["original"][1:])
+        embedding = np.random.default_rng(seed).normal(size=8).astype(np.float32)
+        match, score = index.search(embedding, "moderate", True, threshold=0.99)
+        assert match["original"] == entry["original"] and score > 0.99
+
+    stats = AttemptPolicy(str(tmp_path / "policy.json"))._stats["k"]
+    assert sum(counts["tries"] for counts in stats.values()) == 12
@@ -2,10 +2,16 @@
 Text Simplification Module with Equivalence Validation
 Maintains semantic similarity and difficulty alignment for assessment questions.
 """
-from huggingface_hub import InferenceClient
 from semantic_checker import SemanticChecker
 from difficulty_scorer import DifficultyScorer
 from prompts import SimplificationPrompts
+from prevalidation import PreValidationGate, stream_abort_reason
+from response_cache import ResponseCache
+from duplicate_index import NearDuplicateIndex, adapt_simplification
+from inference_scheduler import RequestCancelled, RequestScheduler, configure_connection_pool
+from attempt_policy import AttemptPolicy
+from inference_backends import InferenceBackend, create_backend
+from coalescing import SingleFlight
 from models import (
     ConversionResult, 
     ConversionStatus, 
@@ -14,13 +20,22 @@ from models import (
     AssessmentItem
 )
 from config import config
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import asyncio
 import logging
+import threading
+import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class DeadlineExceeded(Exception):
+    """Raised inside the generation loop when a conversion's time budget runs out."""
+
+
 class TextSimplifier:
     """
     Text simplification engine with validation and adaptive regeneration.
@@ -31,24 +46,67 @@ class TextSimplifier:
     - Math notation preservation
     """
     
-    def __init__(self, hf_token: Optional[str] = None):
+    def __init__(
+        self,
+        hf_token: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
+        duplicate_index: Optional[NearDuplicateIndex] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        attempt_policy: Optional[AttemptPolicy] = None,
+        backend: Optional[InferenceBackend] = None
+    ):
         """
         Initialize the text simplifier.
         
         Args:
             hf_token: Hugging Face API token (optional, reads from config if not provided)
+            response_cache: LLM response cache (optional, built from config.LLM_CACHE_PATH if not provided)
+            duplicate_index: Index of validated results (optional, built from config when
+                DUPLICATE_INDEX_ENABLED is set)
+            scheduler: Rate limiter / retry policy for LLM requests (optional, built from config)
+            attempt_policy: Learned temperature schedule (optional, built from config when
+                ADAPTIVE_ATTEMPTS is set)
+            backend: LLM backend (optional, built from config.INFERENCE_BACKEND; only the
+                Hugging Face backend needs a token)
         """
         # Use provided token or fall back to config
         self.hf_token = hf_token or config.HF_TOKEN
-        if not self.hf_token:
-            raise ValueError("HF_TOKEN is required. Set it in .env file or pass to constructor.")
+        self.client = backend or create_backend(hf_token=self.hf_token)
         
         # Initialize components
         logger.info("Initializing Text Simplifier components...")
         self.semantic_checker = SemanticChecker()
         self.difficulty_scorer = DifficultyScorer()
         self.prompts = SimplificationPrompts()
-        self.client = InferenceClient(token=self.hf_token)
+        self.prevalidation_gate = PreValidationGate() if config.PREVALIDATION_ENABLED else None
+        
+        # Rate limiting and transient-error retries happen below the attempt loop,
+        # so a 429 or 503 no longer costs one of the MAX_ATTEMPTS
+        self.scheduler = scheduler or RequestScheduler()
+        if config.HTTP_POOL_SIZE > 0:
+            configure_connection_pool(config.HTTP_POOL_SIZE)
+        
+        # Optional LLM response cache; set bypass_cache=True to force fresh sampling
+        if response_cache is None and config.LLM_CACHE_PATH:
+            max_age_days = config.LLM_CACHE_MAX_AGE_DAYS
+            response_cache = ResponseCache(
+                config.LLM_CACHE_PATH,
+                max_entries=config.LLM_CACHE_MAX_ENTRIES,
+                max_age_seconds=max_age_days * 86400 if max_age_days > 0 else None
+            )
+        self.response_cache = response_cache
+        self.bypass_cache = config.LLM_CACHE_BYPASS
+        
+        # Optional near-duplicate index; validated results are reused for near-identical originals
+        if duplicate_index is None and config.DUPLICATE_INDEX_ENABLED:
+            duplicate_index = NearDuplicateIndex(config.DUPLICATE_INDEX_PATH or None)
+        self.duplicate_index = duplicate_index
+        self.duplicate_threshold = config.DUPLICATE_THRESHOLD
+        
+        # Optional adaptive attempt policy; learns which temperatures pass for which items
+        if attempt_policy is None and config.ADAPTIVE_ATTEMPTS:
+            attempt_policy = AttemptPolicy(config.ATTEMPT_POLICY_PATH or None)
+        self.attempt_policy = attempt_policy
         
         # Configuration from config file
         self.semantic_threshold = config.SEMANTIC_THRESHOLD
@@ -56,6 +114,14 @@ class TextSimplifier:
         self.max_attempts = config.MAX_ATTEMPTS
         self.base_temperature = config.BASE_TEMPERATURE
         self.temperature_increment = config.TEMPERATURE_INCREMENT
+        self.speculative_candidates = config.SPECULATIVE_CANDIDATES
+        self.streaming = config.LLM_STREAMING
+        
+        # Concurrent identical requests share one generate/validate run
+        self.single_flight = SingleFlight() if config.COALESCE_REQUESTS else None
+        
+        # Per-thread flag: whether the last completion came from the response cache
+        self._local = threading.local()
         
         logger.info("✓ Text Simplifier initialized successfully!")
     
@@ -63,7 +129,8 @@ class TextSimplifier:
         self, 
         item: AssessmentItem,
         simplification_level: str = "moderate",
-        preserve_math: bool = True
+        preserve_math: bool = True,
+        deadline: Optional[float] = None
     ) -> ConversionResult:
         """
         Convert assessment item to simplified text format.
@@ -74,25 +141,262 @@ class TextSimplifier:
             item: AssessmentItem object containing the question
             simplification_level: "minimal", "moderate", or "significant"
             preserve_math: Whether to keep math notation intact
+            deadline: Time budget in seconds (None = config.CONVERT_DEADLINE, 0 = no limit).
+                When it runs out, in-flight generation is abandoned and the best
+                candidate so far is returned as FLAGGED (FAILED if there is none).
             
         Returns:
             ConversionResult with standardized format
         """
+        deadline = config.CONVERT_DEADLINE if deadline is None else deadline
+        deadline_at = time.monotonic() + deadline if deadline > 0 else None
+        
         logger.info(f"\n{'='*80}")
         logger.info(f"SIMPLIFYING ITEM: {item.id}")
         logger.info(f"TEXT: {item.text[:60]}...")
         logger.info(f"{'='*80}\n")
         
         # Run simplification with validation
-        result = self._simplify_with_validation(
-            item.text, 
-            simplification_level, 
-            preserve_math
-        )
+        def simplify():
+            return self._simplify_with_validation(
+                item.text, 
+                simplification_level, 
+                preserve_math,
+                deadline_at
+            )
+        
+        if self.single_flight is not None:
+            key = (item.text, simplification_level, preserve_math, config.LLM_MODEL)
+            wait = max(deadline_at - time.monotonic(), 0) if deadline_at is not None else None
+            try:
+                result, shared = self.single_flight.do(key, simplify, timeout=wait)
+            except TimeoutError:
+                # The identical request ahead of us outlived our own deadline
+                result, shared = self._finalize_result(None, False, timed_out=True), False
+            if shared:
+                logger.info(f"🔗 Item {item.id} shared an identical in-flight request")
+                if result.get("timed_out") and (deadline_at is None or time.monotonic() < deadline_at):
+                    # The leader ran out of its (shorter) time budget; use the rest of ours
+                    result = simplify()
+        else:
+            result = simplify()
         
         # Convert to standardized ConversionResult
         return self._to_conversion_result(item, result)
     
+    def convert_levels(
+        self,
+        item: AssessmentItem,
+        levels: Sequence[str] = ("minimal", "moderate", "significant"),
+        preserve_math: bool = True
+    ) -> Dict[str, ConversionResult]:
+        """
+        Convert an assessment item to several simplification levels at once.
+        
+        All levels are requested in one structured prompt and validated in one
+        batched pass against a single embedding and difficulty score of the
+        original. Levels that are missing from the response or fail validation
+        fall back to the usual per-level regeneration loop.
+        
+        Args:
+            item: AssessmentItem object containing the question
+            levels: Simplification levels to produce
+            preserve_math: Whether to keep math notation intact
+            
+        Returns:
+            dict mapping each level to its ConversionResult
+        """
+        levels = list(dict.fromkeys(levels))
+        logger.info(f"\n{'='*80}")
+        logger.info(f"SIMPLIFYING ITEM: {item.id} (levels: {', '.join(levels)})")
+        logger.info(f"TEXT: {item.text[:60]}...")
+        logger.info(f"{'='*80}\n")
+        
+        original_text = item.text
+        orig_score = self.difficulty_scorer.calculate_difficulty(original_text)["composite_difficulty"]
+        original_embedding = self.semantic_checker.embed(original_text)
+        
+        results = {}
+        if self.duplicate_index is not None:
+            for level in levels:
+                reused = self._reuse_duplicate(
+                    original_text, level, preserve_math, original_embedding, orig_score
+                )
+                if reused is not None:
+                    results[level] = reused
+        
+        pending = [level for level in levels if level not in results]
+        combined = {}
+        if pending:
+            logger.info(f"🔄 Requesting {len(pending)} level(s) in one prompt")
+            prompt = self.prompts.get_multilevel_prompt(original_text, pending, preserve_math)
+            response = self._complete(
+                prompt,
+                original_text,
+                self.base_temperature,
+                max_tokens=config.MAX_TOKENS * len(pending),
+                max_length_ratio=config.PREVALIDATION_MAX_LENGTH_RATIO * len(pending)
+            )
+            parsed = self.prompts.parse_multilevel_response(response or "", pending)
+            parsed_levels = [level for level in pending if level in parsed]
+            candidates = self._evaluate_candidates(
+                original_text,
+                original_embedding,
+                orig_score,
+                [(1, parsed[level]) for level in parsed_levels],
+                preserve_math
+            )
+            combined = dict(zip(parsed_levels, candidates))
+        
+        for level in pending:
+            candidate = combined.get(level)
+            if candidate is not None and candidate["semantic_pass"] and candidate["difficulty_pass"]:
+                logger.info(f"  ✅ {level}: all checks passed")
+                result = self._finalize_result(candidate, True, self._format_rejections(candidate))
+                if self.duplicate_index is not None:
+                    self.duplicate_index.add(
+                        original_text, original_embedding, result["simplified_text"], level, preserve_math
+                    )
+                results[level] = result
+                continue
+            
+            logger.info(f"  ↩️ {level}: {'failed validation' if candidate else 'missing from response'}, regenerating")
+            # The index was already searched for every level above
+            result = self._simplify_from_anchor(
+                original_text, level, preserve_math, original_embedding, orig_score,
+                search_duplicates=False
+            )
+            # Keep the combined candidate if the fallback found nothing better
+            if (
+                candidate is not None
+                and not result["success"]
+                and (result["simplified_text"] is None or candidate["overall_score"] > result["overall_score"])
+            ):
+                result = self._finalize_result(candidate, False, self._format_rejections(candidate))
+            results[level] = result
+        
+        return {level: self._to_conversion_result(item, results[level]) for level in levels}
+    
+    def convert_many(
+        self,
+        items: Iterable[AssessmentItem],
+        concurrency: Optional[int] = None,
+        simplification_level: str = "moderate",
+        preserve_math: bool = True,
+        deadline: Optional[float] = None
+    ) -> Iterator[ConversionResult]:
+        """
+        Convert many assessment items concurrently.
+        
+        Each item runs the full generate/validate loop on a worker thread, so at
+        most `concurrency` items are processed at any time. That is also the
+        LLM request bound in sequential mode; with SPECULATIVE_CANDIDATES = K > 1
+        each item has up to K requests in flight (use LLM_MAX_IN_FLIGHT to cap
+        the total). Results are yielded as they complete (not in input order);
+        use `item_id` to match them back to their items.
+        
+        Args:
+            items: AssessmentItem objects to convert
+            concurrency: Maximum items processed at once (defaults to config.BATCH_CONCURRENCY)
+            simplification_level: "minimal", "moderate", or "significant"
+            preserve_math: Whether to keep math notation intact
+            deadline: Per-item time budget in seconds (see convert())
+            
+        Yields:
+            ConversionResult for each item, in completion order
+        """
+        concurrency = concurrency or config.BATCH_CONCURRENCY
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [
+                executor.submit(self._convert_safe, item, simplification_level, preserve_math, deadline)
+                for item in items
+            ]
+            try:
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                # Stop queued items if the caller stops consuming early
+                for future in futures:
+                    future.cancel()
+                if self.attempt_policy is not None:
+                    self.attempt_policy.flush()
+    
+    async def aconvert_many(
+        self,
+        items: Iterable[AssessmentItem],
+        concurrency: Optional[int] = None,
+        simplification_level: str = "moderate",
+        preserve_math: bool = True,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[ConversionResult]:
+        """
+        Async variant of convert_many() for use inside an event loop.
+        
+        The blocking generate/validate loop runs in a bounded thread pool so the
+        event loop stays responsive (the same bounds as convert_many() apply).
+        Results are yielded as they complete. If the consumer stops early or is
+        cancelled, queued items are dropped and the pool is shut down without
+        waiting, so the event loop is never blocked on running conversions.
+        
+        Args:
+            items: AssessmentItem objects to convert
+            concurrency: Maximum items processed at once (defaults to config.BATCH_CONCURRENCY)
+            simplification_level: "minimal", "moderate", or "significant"
+            preserve_math: Whether to keep math notation intact
+            deadline: Per-item time budget in seconds (see convert())
+            
+        Yields:
+            ConversionResult for each item, in completion order
+        """
+        concurrency = concurrency or config.BATCH_CONCURRENCY
+        loop = asyncio.get_running_loop()
+        
+        # No `with`: its exit would wait for running conversions on the event loop thread
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        tasks = []
+        try:
+            tasks = [
+                loop.run_in_executor(
+                    executor, self._convert_safe, item, simplification_level, preserve_math, deadline
+                )
+                for item in items
+            ]
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+            if self.attempt_policy is not None:
+                self.attempt_policy.flush()
+    
+    def _convert_safe(
+        self,
+        item: AssessmentItem,
+        simplification_level: str,
+        preserve_math: bool,
+        deadline: Optional[float] = None
+    ) -> ConversionResult:
+        """
+        Run convert() for a batch worker, turning unexpected errors into a FAILED result
+        so one bad item cannot abort the whole batch.
+        """
+        try:
+            return self.convert(item, simplification_level, preserve_math, deadline)
+        except Exception as e:
+            logger.error(f"✗ Conversion of item {item.id} failed: {e}")
+            return ConversionResult(
+                status=ConversionStatus.FAILED,
+                format_type=FormatType.SIMPLIFIED_TEXT,
+                original_text=item.text,
+                converted_content=None,
+                metrics=ValidationMetrics(),
+                iterations_taken=0,
+                error_message=str(e),
+                item_id=item.id
+            )
+    
     def simplify(
         self, 
         original_text: str, 
@@ -113,49 +417,332 @@ class TextSimplifier:
         self,
         original_text: str,
         simplification_level: str,
-        preserve_math: bool
+        preserve_math: bool,
+        deadline_at: Optional[float] = None
     ) -> dict:
         """
         Internal method: Simplify text with validation and adaptive regeneration.
+        
+        deadline_at is an absolute time.monotonic() value (None = no time limit).
         """
         # Calculate original difficulty
         original_difficulty = self.difficulty_scorer.calculate_difficulty(original_text)
         orig_score = original_difficulty["composite_difficulty"]
         
+        # Embed the original once; every attempt compares against this anchor
+        original_embedding = self.semantic_checker.embed(original_text)
+        
+        return self._simplify_from_anchor(
+            original_text,
+            simplification_level,
+            preserve_math,
+            original_embedding,
+            orig_score,
+            deadline_at
+        )
+    
+    def _simplify_from_anchor(
+        self,
+        original_text: str,
+        simplification_level: str,
+        preserve_math: bool,
+        original_embedding,
+        orig_score: float,
+        deadline_at: Optional[float] = None,
+        search_duplicates: bool = True
+    ) -> dict:
+        """
+        Internal method: Simplify text given the original's embedding and difficulty score.
+        
+        search_duplicates=False skips the near-duplicate lookup (for callers that
+        already searched the index for this item).
+        """
+        if self.duplicate_index is not None and search_duplicates:
+            reused = self._reuse_duplicate(
+                original_text,
+                simplification_level,
+                preserve_math,
+                original_embedding,
+                orig_score
+            )
+            if reused is not None:
+                return reused
+        
+        if self.speculative_candidates > 1:
+            result = self._simplify_speculative(
+                original_text,
+                simplification_level,
+                preserve_math,
+                original_embedding,
+                orig_score,
+                deadline_at
+            )
+        else:
+            result = self._simplify_sequential(
+                original_text,
+                simplification_level,
+                preserve_math,
+                original_embedding,
+                orig_score,
+                deadline_at
+            )
+        
+        if self.duplicate_index is not None and result["success"]:
+            self.duplicate_index.add(
+                original_text,
+                original_embedding,
+                result["simplified_text"],
+                simplification_level,
+                preserve_math
+            )
+        if self.attempt_policy is not None:
+            self.attempt_policy.save_if_due()
+        return result
+    
+    def _reuse_duplicate(
+        self,
+        original_text: str,
+        simplification_level: str,
+        preserve_math: bool,
+        original_embedding,
+        orig_score: float
+    ) -> Optional[dict]:
+        """
+        Internal method: Reuse the validated result of a near-identical earlier original.
+        
+        The prior simplification (with differing numbers substituted) is run through
+        the normal validators without any LLM call. Returns None when there is no
+        match or the adapted text does not pass, so the caller generates as usual.
+        """
+        match = self.duplicate_index.search(
+            original_embedding, simplification_level, preserve_math, self.duplicate_threshold
+        )
+        if match is None:
+            return None
+        
+        entry, similarity = match
+        adapted = adapt_simplification(entry["original"], entry["simplified"], original_text)
+        if adapted is None:
+            logger.info(f"♻️ Near-duplicate found ({similarity:.3f}) but it differs in more than its numbers")
+            return None
+        
+        # Attempt 0 marks a result that needed no LLM call
+        candidate = self._evaluate_candidates(
+            original_text,
+            original_embedding,
+            orig_score,
+            [(0, adapted)],
+            preserve_math
+        )[0]
+        if not (candidate["semantic_pass"] and candidate["difficulty_pass"]):
+            logger.info(f"♻️ Near-duplicate found ({similarity:.3f}) but the adapted text failed validation")
+            return None
+        
+        logger.info(f"♻️ Reused validated result of a near-duplicate ({similarity:.3f})\n")
+        return self._finalize_result(candidate, True)
+    
+    def _simplify_sequential(
+        self,
+        original_text: str,
+        simplification_level: str,
+        preserve_math: bool,
+        original_embedding,
+        orig_score: float,
+        deadline_at: Optional[float] = None
+    ) -> dict:
+        """
+        Internal method: Generate one candidate per attempt until one passes
+        (or the deadline runs out).
+        
+        Attempt i normally uses temperature step i - 1; with an attempt policy the
+        steps (and how many of them) come from the statistics of similar items.
+        """
         best_result = None
-        best_overall_score = 0
+        rejection_reasons = []
         
-        for attempt in range(1, self.max_attempts + 1):
-            logger.info(f"🔄 Attempt {attempt}/{self.max_attempts}")
+        steps = list(range(self.max_attempts))
+        policy_key = None
+        if self.attempt_policy is not None:
+            policy_key = AttemptPolicy.bucket_key(original_text, simplification_level, orig_score)
+            steps = self.attempt_policy.plan(policy_key)
+        
+        for attempt, step in enumerate(steps, 1):
+            logger.info(f"🔄 Attempt {attempt}/{len(steps)}")
             
             # Generate simplified version
-            simplified = self._call_llm(
-                original_text, 
-                simplification_level, 
-                preserve_math, 
-                attempt
-            )
+            try:
+                simplified, from_cache = self._generate(
+                    original_text, 
+                    simplification_level, 
+                    preserve_math, 
+                    attempt,
+                    deadline_at,
+                    step
+                )
+            except DeadlineExceeded:
+                return self._finalize_result(best_result, False, rejection_reasons, timed_out=True)
             
             if not simplified:
                 logger.warning("  ✗ Generation failed")
                 continue
             
-            # Validate semantic similarity
-            semantic_score = self.semantic_checker.check_similarity(
-                original_text, 
-                simplified
+            candidate = self._evaluate_candidates(
+                original_text,
+                original_embedding,
+                orig_score,
+                [(attempt, simplified)],
+                preserve_math
+            )[0]
+            rejection_reasons.extend(self._format_rejections(candidate))
+            # Cached responses are replays of attempts that were already recorded
+            if policy_key is not None and not from_cache:
+                self.attempt_policy.record(
+                    policy_key, step, candidate["semantic_pass"] and candidate["difficulty_pass"]
+                )
+            
+            # Track best result
+            if best_result is None or candidate["overall_score"] > best_result["overall_score"]:
+                best_result = candidate
+            
+            # Check if all validations passed
+            if candidate["semantic_pass"] and candidate["difficulty_pass"]:
+                logger.info(f"  ✅ All checks passed!\n")
+                return self._finalize_result(candidate, True, rejection_reasons)
+            
+            logger.info(f"  ⚠️ Validation failed, trying again...\n")
+        
+        return self._finalize_result(best_result, False, rejection_reasons)
+    
+    def _simplify_speculative(
+        self,
+        original_text: str,
+        simplification_level: str,
+        preserve_math: bool,
+        original_embedding,
+        orig_score: float,
+        deadline_at: Optional[float] = None
+    ) -> dict:
+        """
+        Internal method: Generate all candidates at once and keep the best one.
+        
+        The escalating temperatures of the sequential loop are requested in
+        parallel, so worst-case latency is about one LLM round trip instead of
+        one per attempt, at the cost of always paying for every candidate.
+        Candidates still generating at the deadline are abandoned.
+        """
+        num_candidates = self.speculative_candidates
+        logger.info(f"🚀 Speculative generation: {num_candidates} candidates in parallel")
+        
+        with ThreadPoolExecutor(max_workers=num_candidates) as executor:
+            futures = [
+                (attempt, executor.submit(
+                    self._generate,
+                    original_text,
+                    simplification_level,
+                    preserve_math,
+                    attempt,
+                    deadline_at
+                ))
+                for attempt in range(1, num_candidates + 1)
+            ]
+            generated = []
+            cached_attempts = set()
+            timed_out = False
+            for attempt, future in futures:
+                try:
+                    simplified, from_cache = future.result()
+                except DeadlineExceeded:
+                    timed_out = True
+                    continue
+                generated.append((attempt, simplified))
+                if from_cache:
+                    cached_attempts.add(attempt)
+        
+        generated = [(attempt, text) for attempt, text in generated if text]
+        if len(generated) < num_candidates:
+            logger.warning(f"  ✗ {num_candidates - len(generated)} generation(s) failed")
+        
+        candidates = self._evaluate_candidates(
+            original_text,
+            original_embedding,
+            orig_score,
+            generated,
+            preserve_math
+        )
+        rejection_reasons = [
+            reason for candidate in candidates for reason in self._format_rejections(candidate)
+        ]
+        if self.attempt_policy is not None:
+            policy_key = AttemptPolicy.bucket_key(original_text, simplification_level, orig_score)
+            for candidate in candidates:
+                if candidate["attempt"] in cached_attempts:
+                    continue
+                self.attempt_policy.record(
+                    policy_key,
+                    candidate["attempt"] - 1,
+                    candidate["semantic_pass"] and candidate["difficulty_pass"]
+                )
+        
+        # Prefer candidates that pass every check; rank by the usual overall score
+        passing = [c for c in candidates if c["semantic_pass"] and c["difficulty_pass"]]
+        best_result = max(passing or candidates, key=lambda c: c["overall_score"], default=None)
+        
+        if passing:
+            logger.info(f"  ✅ Candidate {best_result['attempt']} passed all checks!\n")
+        return self._finalize_result(
+            best_result, bool(passing), rejection_reasons, timed_out=timed_out and not passing
+        )
+    
+    def _evaluate_candidates(
+        self,
+        original_text: str,
+        original_embedding,
+        orig_score: float,
+        candidates: List[Tuple[int, str]],
+        preserve_math: bool = True
+    ) -> List[dict]:
+        """
+        Validate (attempt, simplified_text) candidates against the original.
+        
+        Candidates first go through the cheap pre-validation gate; rejected ones
+        skip the expensive validators. The rest are embedded and difficulty-scored in
+        single batches, then get the semantic and difficulty checks plus the
+        weighted overall quality score.
+        """
+        results = [None] * len(candidates)
+        accepted = []
+        for index, (attempt, simplified) in enumerate(candidates):
+            reasons = (
+                self.prevalidation_gate.check(original_text, simplified, preserve_math)
+                if self.prevalidation_gate else []
             )
+            if reasons:
+                logger.info(f"  🚫 [{attempt}] Rejected by pre-validation: {'; '.join(reasons)}")
+                results[index] = {
+                    "simplified_text": simplified,
+                    "semantic_score": None,
+                    "semantic_pass": False,
+                    "difficulty_change": None,
+                    "difficulty_pass": False,
+                    "attempt": attempt,
+                    "overall_score": 0.0,
+                    "rejection_reasons": reasons,
+                }
+            else:
+                accepted.append((index, attempt, simplified))
+        
+        accepted_texts = [simplified for _, _, simplified in accepted]
+        semantic_scores = self.semantic_checker.compare_to_anchor(original_embedding, accepted_texts)
+        difficulties = self.difficulty_scorer.score_many(accepted_texts)
+        
+        for (index, attempt, simplified), semantic_score, simp_difficulty in zip(
+            accepted, semantic_scores, difficulties
+        ):
             semantic_pass = semantic_score >= self.semantic_threshold
             
             # Validate difficulty alignment
-            simp_difficulty = self.difficulty_scorer.calculate_difficulty(simplified)
             simp_score = simp_difficulty["composite_difficulty"]
-            
-            if orig_score > 0:
-                difficulty_change = abs(simp_score - orig_score) / orig_score * 100
-            else:
-                difficulty_change = 0
-                
+            difficulty_change = self.difficulty_scorer.relative_change(orig_score, simp_score)
             difficulty_pass = difficulty_change <= self.difficulty_threshold
             
             # Calculate overall quality score
@@ -164,34 +751,61 @@ class TextSimplifier:
                 ((100 - min(difficulty_change, 100)) / 100 * 0.3)
             )
             
-            logger.info(f"  📊 Semantic: {semantic_score:.3f} {'✓' if semantic_pass else '✗'}")
-            logger.info(f"  📊 Difficulty: {difficulty_change:.1f}% change {'✓' if difficulty_pass else '✗'}")
-            
-            # Track best result
-            if overall_score > best_overall_score:
-                best_overall_score = overall_score
-                best_result = {
-                    "simplified_text": simplified,
-                    "semantic_score": semantic_score,
-                    "semantic_pass": semantic_pass,
-                    "difficulty_change": difficulty_change,
-                    "difficulty_pass": difficulty_pass,
-                    "attempt": attempt,
-                }
-            
-            # Check if all validations passed
-            if semantic_pass and difficulty_pass:
-                logger.info(f"  ✅ All checks passed!\n")
-                best_result["success"] = True
-                best_result["flagged"] = False
-                return best_result
+            logger.info(f"  📊 [{attempt}] Semantic: {semantic_score:.3f} {'✓' if semantic_pass else '✗'}")
+            logger.info(f"  📊 [{attempt}] Difficulty: {difficulty_change:.1f}% change {'✓' if difficulty_pass else '✗'}")
             
-            logger.info(f"  ⚠️ Validation failed, trying again...\n")
+            results[index] = {
+                "simplified_text": simplified,
+                "semantic_score": semantic_score,
+                "semantic_pass": semantic_pass,
+                "difficulty_change": difficulty_change,
+                "difficulty_pass": difficulty_pass,
+                "attempt": attempt,
+                "overall_score": overall_score,
+                "rejection_reasons": [],
+            }
+        return results
+    
+    @staticmethod
+    def _format_rejections(candidate: dict) -> List[str]:
+        """Prefix a candidate's pre-validation rejection reasons with its attempt number."""
+        return [f"attempt {candidate['attempt']}: {reason}" for reason in candidate["rejection_reasons"]]
+    
+    def _finalize_result(
+        self,
+        best_result: Optional[dict],
+        success: bool,
+        rejection_reasons: Optional[List[str]] = None,
+        timed_out: bool = False
+    ) -> dict:
+        """
+        Mark the chosen candidate as validated or flagged (or build a failure
+        result when no candidate could be generated at all).
+        """
+        if timed_out:
+            logger.warning("⏱️ Deadline exceeded, returning the best candidate so far")
         
-        # Max attempts reached
-        logger.warning(f"⚠️ Max attempts reached. Flagged for review\n")
-        best_result["success"] = False
-        best_result["flagged"] = True
+        if best_result is None:
+            logger.error("✗ No candidate could be generated\n")
+            return {
+                "simplified_text": None,
+                "semantic_score": None,
+                "semantic_pass": False,
+                "difficulty_change": None,
+                "difficulty_pass": False,
+                "attempt": self.max_attempts,
+                "success": False,
+                "flagged": False,
+                "rejection_reasons": rejection_reasons or [],
+                "timed_out": timed_out,
+            }
+        
+        if not success and not timed_out:
+            logger.warning(f"⚠️ Max attempts reached. Flagged for review\n")
+        best_result["success"] = success
+        best_result["flagged"] = not success
+        best_result["rejection_reasons"] = rejection_reasons or []
+        best_result["timed_out"] = timed_out
         return best_result
     
     def _call_llm(
@@ -199,30 +813,175 @@ class TextSimplifier:
         original: str, 
         level: str, 
         preserve_math: bool, 
-        attempt: int
+        attempt: int,
+        deadline_at: Optional[float] = None,
+        temperature_step: Optional[int] = None
     ) -> Optional[str]:
         """
         Call Hugging Face LLM API with adaptive temperature.
         
-        Temperature increases with each attempt to generate more diverse outputs.
+        Temperature increases with each attempt to generate more diverse outputs
+        (temperature_step overrides the attempt's default step of attempt - 1).
+        Responses are served from / written to the response cache when one is configured.
+        In streaming mode an aborted generation returns None and is not cached.
+        Raises DeadlineExceeded if deadline_at passes before the response arrives.
         """
-        temperature = self.base_temperature + (attempt - 1) * self.temperature_increment
+        step = attempt - 1 if temperature_step is None else temperature_step
+        temperature = self.base_temperature + step * self.temperature_increment
         prompt = self.prompts.get_simplification_prompt(original, level, preserve_math)
+        return self._complete(prompt, original, temperature, deadline_at=deadline_at)
+    
+    def _generate(self, *args) -> Tuple[Optional[str], bool]:
+        """_call_llm() plus whether its response was served from the response cache."""
+        self._local.from_cache = False
+        simplified = self._call_llm(*args)
+        return simplified, self._local.from_cache
+    
+    def _complete(
+        self,
+        prompt: str,
+        original: str,
+        temperature: float,
+        max_tokens: Optional[int] = None,
+        max_length_ratio: Optional[float] = None,
+        deadline_at: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Send one prompt to the LLM (through the response cache) and return the stripped text.
+        
+        max_length_ratio bounds streamed output relative to the original (defaults to
+        the pre-validation bound); returns None on API errors or aborted streams.
+        """
+        if deadline_at is not None and time.monotonic() >= deadline_at:
+            raise DeadlineExceeded()
+        
+        max_tokens = max_tokens or config.MAX_TOKENS
+        cache_key = None
+        if self.response_cache is not None:
+            cache_key = ResponseCache.make_key(
+                config.LLM_MODEL, prompt, temperature, max_tokens
+            )
+            if not self.bypass_cache:
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    logger.info("  ⚡ Served from response cache")
+                    self._local.from_cache = True
+                    return cached
         
         messages = [{"role": "user", "content": prompt}]
+        request = (original, messages, temperature, max_tokens, max_length_ratio)
+        
+        if deadline_at is None:
+            simplified = self._request_completion(*request)
+            if cache_key is not None and simplified:
+                self.response_cache.put(cache_key, simplified)
+            return simplified
+        return self._request_before_deadline(deadline_at, cache_key, *request)
+    
+    def _request_before_deadline(self, deadline_at: float, cache_key: Optional[str], *request) -> Optional[str]:
+        """
+        Run _request_completion() on a helper thread and stop waiting at the deadline.
         
+        At the deadline the request is cancelled: a streamed request is closed at
+        the next chunk, and a plain one is not retried or started if it is still
+        waiting in the scheduler. A plain request already sent cannot be
+        interrupted; its response is still cached when it arrives late.
+        """
+        cancel_event = threading.Event()
+        outcome = {}
+        
+        def run():
+            text = self._request_completion(*request, cancel_event=cancel_event)
+            outcome["text"] = text
+            if cache_key is not None and text:
+                self.response_cache.put(cache_key, text)
+        
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        worker.join(max(deadline_at - time.monotonic(), 0))
+        if worker.is_alive():
+            cancel_event.set()
+            logger.warning("  ⏱️ Deadline reached during generation, request cancelled")
+            raise DeadlineExceeded()
+        return outcome.get("text")
+    
+    def _request_completion(
+        self,
+        original: str,
+        messages: List[dict],
+        temperature: float,
+        max_tokens: int,
+        max_length_ratio: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Optional[str]:
+        """
+        Make the chat completion request (streamed or not); None on API errors.
+        """
         try:
-            response = self.client.chat_completion(
+            if self.streaming:
+                return self._stream_completion(
+                    original, messages, temperature, max_tokens, max_length_ratio, cancel_event
+                )
+            response = self.scheduler.call(
+                self.client.chat_completion,
                 messages=messages,
                 model=config.LLM_MODEL,
-                max_tokens=config.MAX_TOKENS,
-                temperature=temperature
+                max_tokens=max_tokens,
+                temperature=temperature,
+                cancel_event=cancel_event
             )
             return response.choices[0].message.content.strip()
+        except RequestCancelled:
+            return None
         except Exception as e:
             logger.error(f"  ✗ LLM API Error: {e}")
             return None
     
+    def _stream_completion(
+        self,
+        original: str,
+        messages: List[dict],
+        temperature: float,
+        max_tokens: int,
+        max_length_ratio: Optional[float] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Optional[str]:
+        """
+        Stream a completion, stopping as soon as the partial output is unusable
+        or cancel_event is set.
+        
+        Closing the stream drops the connection, so the server stops generating
+        the rest of the (wasted) tokens.
+        """
+        stream = self.scheduler.call(
+            self.client.chat_completion,
+            messages=messages,
+            model=config.LLM_MODEL,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            cancel_event=cancel_event
+        )
+        parts = []
+        try:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if cancel_event is not None and cancel_event.is_set():
+                    return None
+                if not delta:
+                    continue
+                parts.append(delta)
+                partial = "".join(parts)
+                reason = stream_abort_reason(original, partial, max_length_ratio)
+                if reason:
+                    logger.info(f"  ✂️ Stream aborted after {len(partial)} chars: {reason}")
+                    return None
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+        return "".join(parts).strip()
+    
     def _to_conversion_result(
         self, 
         item: AssessmentItem, 
@@ -244,9 +1003,20 @@ class TextSimplifier:
             semantic_similarity=result["semantic_score"],
             difficulty_change=result["difficulty_change"],
             semantic_pass=result["semantic_pass"],
-            difficulty_pass=result["difficulty_pass"]
+            difficulty_pass=result["difficulty_pass"],
+            rejection_reasons=list(result.get("rejection_reasons") or [])
         )
         
+        warnings = [] if result["success"] else ["Failed validation checks"]
+        error_message = None
+        if not result["simplified_text"]:
+            error_message = (
+                "Conversion deadline exceeded before any candidate was generated"
+                if result.get("timed_out") else "LLM generation failed on every attempt"
+            )
+        elif result.get("timed_out"):
+            warnings.append("Conversion deadline exceeded; best candidate so far returned")
+        
         # Create conversion result
         return ConversionResult(
             status=status,
@@ -255,5 +1025,7 @@ class TextSimplifier:
             converted_content=result["simplified_text"],
             metrics=metrics,
             iterations_taken=result["attempt"],
-            warnings=[] if result["success"] else ["Failed validation checks"]
+            error_message=error_message,
+            warnings=warnings,
+            item_id=item.id
         )
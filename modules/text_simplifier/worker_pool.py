@@ -0,0 +1,332 @@
+"""
+Preload-then-fork worker pool for scaling the simplifier across cores.
+
+The parent process builds one TextSimplifier (loading MiniLM and spaCy once),
+freezes the heap and then forks the workers. Model weights are inherited
+copy-on-write instead of being loaded again by every process, and workers
+pull items from a shared local queue.
+
+The near-duplicate index and the attempt policy have a single writer: the
+parent. Workers search and plan from the state they inherited at fork time
+and send their index additions and attempt outcomes back over the result
+queue, so files under DUPLICATE_INDEX_PATH / ATTEMPT_POLICY_PATH are never
+written by two processes.
+"""
+from text_simplifier import TextSimplifier
+from models import AssessmentItem, ConversionResult
+from model_registry import current_rss_bytes
+from config import config
+from typing import Callable, Dict, Iterable, Iterator, Optional
+import gc
+import logging
+import multiprocessing as mp
+import os
+import queue
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+# Set in the parent before fork(); every worker inherits it copy-on-write
+_simplifier: Optional[TextSimplifier] = None
+
+
+def read_memory_mb() -> Dict[str, float]:
+    """
+    Memory of the current process in MB: rss, plus pss/shared/private on Linux.
+
+    PSS (proportional set size) splits shared pages between the processes that
+    map them, so the sum of PSS across workers is the real footprint.
+    """
+    memory = {"rss_mb": round(current_rss_bytes() / (1024 * 1024), 1)}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict(
+                (parts[0].rstrip(":"), int(parts[1]))
+                for parts in (line.split() for line in f)
+                if len(parts) >= 2 and parts[1].isdigit()
+            )
+    except OSError:
+        return memory
+
+    kb_to_mb = 1 / 1024
+    memory["pss_mb"] = round(fields.get("Pss", 0) * kb_to_mb, 1)
+    memory["shared_mb"] = round(
+        (fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)) * kb_to_mb, 1
+    )
+    memory["private_mb"] = round(
+        (fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)) * kb_to_mb, 1
+    )
+    return memory
+
+
+class _ForwardedIndex:
+    """Worker-side NearDuplicateIndex: searches the inherited copy, sends add() to the parent."""
+
+    def __init__(self, index, worker_id: int, result_queue):
+        self._index = index
+        self._worker_id = worker_id
+        self._result_queue = result_queue
+
+    def __getattr__(self, name):
+        return getattr(self._index, name)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, *args):
+        self._result_queue.put(("index", self._worker_id, args))
+
+
+class _ForwardedPolicy:
+    """Worker-side AttemptPolicy: learns locally, sends each outcome to the parent to save."""
+
+    def __init__(self, policy, worker_id: int, result_queue):
+        self._policy = policy
+        self._worker_id = worker_id
+        self._result_queue = result_queue
+
+    def __getattr__(self, name):
+        return getattr(self._policy, name)
+
+    def record(self, key: str, step: int, passed: bool):
+        self._policy.record(key, step, passed)
+        self._result_queue.put(("policy", self._worker_id, (key, step, passed)))
+
+    def save(self):
+        pass  # the parent owns the statistics file
+
+    save_if_due = flush = save
+
+
+def _worker_main(worker_id: int, forked_at: float, task_queue, result_queue):
+    """Worker loop: convert items from task_queue until a None sentinel arrives."""
+    # Forked children must not reuse the parent's SQLite connection, and one
+    # intra-op thread per worker avoids oversubscribing the cores.
+    if _simplifier.response_cache is not None:
+        _simplifier.response_cache.reopen()
+    # Index and policy writes go to the parent (the only writer of their files)
+    if _simplifier.duplicate_index is not None:
+        _simplifier.duplicate_index = _ForwardedIndex(_simplifier.duplicate_index, worker_id, result_queue)
+    if _simplifier.attempt_policy is not None:
+        _simplifier.attempt_policy = _ForwardedPolicy(_simplifier.attempt_policy, worker_id, result_queue)
+    if "torch" in sys.modules:
+        sys.modules["torch"].set_num_threads(1)
+
+    result_queue.put(("ready", worker_id, {
+        "startup_seconds": round(time.time() - forked_at, 3),
+        **read_memory_mb(),
+    }))
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        item, simplification_level, preserve_math = task
+        result = _simplifier._convert_safe(item, simplification_level, preserve_math)
+        result_queue.put(("result", worker_id, result))
+
+    result_queue.put(("stopped", worker_id, read_memory_mb()))
+
+
+class PreforkWorkerPool:
+    """
+    Loads the models once in the parent and forks workers that share them.
+
+    Usage:
+        with PreforkWorkerPool(num_workers=4) as pool:
+            for result in pool.map(items):
+                ...
+            print(pool.report())
+    """
+
+    def __init__(
+        self,
+        num_workers: Optional[int] = None,
+        simplifier_factory: Callable[[], TextSimplifier] = TextSimplifier,
+        poll_interval: float = 1.0
+    ):
+        """
+        Args:
+            num_workers: Worker processes to fork (defaults to config.WORKER_PROCESSES)
+            simplifier_factory: Builds the TextSimplifier in the parent before forking
+            poll_interval: Seconds between worker liveness checks while waiting for results
+        """
+        if "fork" not in mp.get_all_start_methods():
+            raise RuntimeError("PreforkWorkerPool requires the 'fork' start method (Linux/macOS)")
+
+        self.num_workers = num_workers or config.WORKER_PROCESSES
+        self.simplifier_factory = simplifier_factory
+        self.poll_interval = poll_interval
+        self._ctx = mp.get_context("fork")
+        self._processes = []
+        self._task_queue = None
+        self._result_queue = None
+        self._preload_stats: Dict[str, float] = {}
+        self._worker_stats: Dict[int, dict] = {}
+
+    def start(self):
+        """Preload models in this process, then fork the workers."""
+        global _simplifier
+
+        logger.info(f"Preloading models before forking {self.num_workers} workers...")
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
+        _simplifier = self.simplifier_factory()
+        # Warm up lazily initialised state so workers inherit it instead of rebuilding it
+        _simplifier.semantic_checker.embed("warm up")
+        _simplifier.difficulty_scorer.calculate_difficulty("Warm up.")
+        self._preload_stats = {
+            "preload_seconds": round(time.perf_counter() - start, 3),
+            "preload_rss_mb": round((current_rss_bytes() - rss_before) / (1024 * 1024), 1),
+            "parent_rss_mb": round(current_rss_bytes() / (1024 * 1024), 1),
+        }
+
+        # Tokenizer thread pools do not survive fork()
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+        # Move everything allocated so far into the permanent generation so GC
+        # passes in the children do not touch (and un-share) those pages
+        gc.collect()
+        gc.freeze()
+
+        self._task_queue = self._ctx.Queue()
+        self._result_queue = self._ctx.Queue()
+        forked_at = time.time()
+        for worker_id in range(self.num_workers):
+            process = self._ctx.Process(
+                target=_worker_main,
+                args=(worker_id, forked_at, self._task_queue, self._result_queue),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+
+        for _ in range(self.num_workers):
+            _, worker_id, stats = self._next_message("starting")
+            self._worker_stats[worker_id] = {"startup": stats}
+        gc.unfreeze()
+        logger.info(f"✓ {self.num_workers} workers ready")
+        return self
+
+    def map(
+        self,
+        items: Iterable[AssessmentItem],
+        simplification_level: str = "moderate",
+        preserve_math: bool = True
+    ) -> Iterator[ConversionResult]:
+        """
+        Convert items on the workers, yielding results as they complete.
+
+        Only one map() may run on a pool at a time. Raises RuntimeError if a
+        worker process dies (its item would never be answered).
+        """
+        if not self._processes:
+            self.start()
+
+        submitted = 0
+        for item in items:
+            self._task_queue.put((item, simplification_level, preserve_math))
+            submitted += 1
+
+        for _ in range(submitted):
+            _, _, result = self._next_message("converting items")
+            yield result
+
+    def close(self):
+        """
+        Stop the workers and collect their final memory figures.
+
+        Results still queued (e.g. from a map() that was not consumed to the
+        end) are discarded, and workers that died are not waited for.
+        """
+        if not self._processes:
+            return
+        running = {worker_id for worker_id, process in enumerate(self._processes) if process.is_alive()}
+        for _ in running:
+            self._task_queue.put(None)
+        while running:
+            try:
+                kind, worker_id, stats = self._result_queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                running = {worker_id for worker_id in running if self._processes[worker_id].is_alive()}
+                continue
+            if kind == "stopped":
+                self._worker_stats.setdefault(worker_id, {})["final"] = stats
+                running.discard(worker_id)
+            else:
+                self._apply_write(kind, stats)
+        for process in self._processes:
+            process.join()
+        self._processes = []
+        if _simplifier.attempt_policy is not None:
+            _simplifier.attempt_policy.flush()
+
+    def _next_message(self, waiting_for: str) -> tuple:
+        """
+        Next (kind, worker_id, payload) from the workers; fails fast if one has died.
+
+        Index additions and attempt outcomes sent by the workers are applied
+        here and not returned.
+        """
+        while True:
+            try:
+                message = self._result_queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                dead = {
+                    worker_id: process.exitcode
+                    for worker_id, process in enumerate(self._processes)
+                    if process.exitcode is not None
+                }
+                if dead:
+                    raise RuntimeError(f"Worker process(es) exited while {waiting_for} (exit codes: {dead})")
+                continue
+            if not self._apply_write(message[0], message[2]):
+                return message
+
+    @staticmethod
+    def _apply_write(kind: str, payload) -> bool:
+        """Apply a worker's index addition or attempt outcome in the parent."""
+        if kind == "index":
+            _simplifier.duplicate_index.add(*payload)
+            return True
+        if kind == "policy":
+            _simplifier.attempt_policy.record(*payload)
+            _simplifier.attempt_policy.save_if_due()
+            return True
+        return False
+
+    def report(self) -> dict:
+        """
+        Preload cost in the parent plus per-worker startup time and memory.
+
+        Measured: `workers_total_rss_mb` sums each worker's RSS, which counts
+        the shared model pages once per worker; `workers_total_pss_mb` (Linux)
+        splits them between the workers and is their real footprint.
+
+        Estimated, not measured: `independent_processes_estimate_mb` is
+        num_workers x parent RSS, roughly what the same workers would need if
+        each loaded its own models.
+        """
+        worker_memory = [
+            stats.get("final", stats.get("startup", {}))
+            for stats in self._worker_stats.values()
+        ]
+        report = {
+            "num_workers": self.num_workers,
+            **self._preload_stats,
+            "workers": dict(sorted(self._worker_stats.items())),
+            "independent_processes_estimate_mb": round(
+                self.num_workers * self._preload_stats.get("parent_rss_mb", 0.0), 1
+            ),
+        }
+        for key in ("rss_mb", "pss_mb"):
+            values = [memory.get(key) for memory in worker_memory]
+            if values and all(value is not None for value in values):
+                report[f"workers_total_{key}"] = round(sum(values), 1)
+        return report
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,145 @@
+"""
+Equivalence check and micro-benchmark for the text cleaner.
+
+First verifies that clean_text (single line-oriented pass) gives exactly the
+output of clean_text_legacy (one regex pass per rule) on a built-in corpus of
+edge cases plus randomly generated documents, then times both on large
+synthetic extracted texts:
+
+    python -m app.bench_preprocessor --sizes 1000 10000 50000 --json cleaner.json
+
+Exits with status 1 if any output differs.
+"""
+from app.preprocessor import clean_text, clean_text_legacy
+from typing import List
+import argparse
+import json
+import random
+import sys
+import time
+
+# Edge cases of the legacy regex chain the single-pass cleaner must reproduce
+EQUIVALENCE_CORPUS = [
+    "",
+    "   \n\t\n  ",
+    "Page 3\n1. What is 2+3?\nA) 4\nB) 5",
+    "PAGE 12 of the test page 4",
+    "Page\n3",                        # "Page" + number across a line break
+    "see page\n\n  7 below",
+    "Answer: 3/4 or 1 / 2",
+    "12\n/ 5",                        # fraction across a line break
+    "12 /\n5",
+    "x/y and 3/ and /4",
+    "Name: __________",
+    "   Name: Alice\nQuestion 1",
+    "Intro\n\n  \n\t\nName: x\nBody",  # Name: swallows the whitespace-only lines above it
+    "Name: a\n\nName: b\nText",
+    "Name: a\nDate: b\nText",          # Date: also swallows the emptied Name: line
+    "Text\n \nDate: today\n\nMore",
+    "Date: 1/2/2024\nPage 1",
+    "Student Name: Bob",               # not at the start of the line
+    "-----\nSECTION A\n=====\n~~~\n***",
+    "a-b -- c --- d _*= e",
+    "••• ●▪◦ items\n• first\n● second",
+    "---•",
+    "one\n\n\ntwo\n\n\n\n\nthree",
+    "a  b   c\t\td \t e",
+    "\t  lead and trail  \t",
+    "Page 2/3\n2/3 Page 4",
+    "line\r\nwindows\r\n\r\n\r\nlines",
+    "x y\n \nName: z",
+    "½ ¾ 1⁄2 ٣/٤",
+]
+
+# Fragments random documents are assembled from (dense in rule triggers)
+FRAGMENTS = [
+    "Page", "page ", "3", "12", " / ", "/", " ", "  ", "\t", "Name:", "Date:", " Name: x",
+    "-", "---", "*", "_", "=", "~", "•", "●", "word", "A)", "1.", "\r", "\n", "\n\n", "\n\n\n", "\n \n",
+]
+
+WORDS = (
+    "the a of to and in is that for it as with on be by this are which an or from "
+    "determine calculate value function energy reaction equation triangle area"
+).split()
+
+
+def random_documents(count: int, seed: int = 0) -> List[str]:
+    """Short random documents built from rule-triggering fragments."""
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 30)))
+        for _ in range(count)
+    ]
+
+
+def exam_document(questions: int, seed: int = 0) -> str:
+    """Synthetic extracted exam paper: headers, numbered questions, options."""
+    rng = random.Random(seed)
+    parts = []
+    for q in range(questions):
+        if q % 25 == 0:
+            parts.append(f"Page {q // 25 + 1}\nName: ________   Date: ______\n\n")
+        parts.append(f"{q + 1}. " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))) + "?\n")
+        for option in "ABCD":
+            parts.append(f"{option}) " + " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 5))) + "\n")
+        if q % 7 == 0:
+            parts.append("• Show your working  \t\n------\n\n\n")
+    return "".join(parts)
+
+
+def check_equivalence(documents: List[str]) -> List[str]:
+    """Documents on which the two cleaners disagree."""
+    return [doc for doc in documents if clean_text(doc) != clean_text_legacy(doc)]
+
+
+def _best_of(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(sizes: List[int], repeat: int = 3) -> dict:
+    runs = []
+    for size in sizes:
+        text = exam_document(size)
+        legacy = _best_of(clean_text_legacy, text, repeat)
+        single_pass = _best_of(clean_text, text, repeat)
+        runs.append({
+            "questions": size,
+            "megabytes": round(len(text.encode("utf-8")) / (1024 * 1024), 2),
+            "legacy_seconds": round(legacy, 4),
+            "single_pass_seconds": round(single_pass, 4),
+            "speedup": round(legacy / single_pass, 2),
+        })
+    return {"repeat": repeat, "runs": runs}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="clean_text equivalence check and micro-benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="Questions per document")
+    parser.add_argument("--random", type=int, default=20000, help="Random documents for the equivalence check")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per size (best is kept)")
+    parser.add_argument("--json", default=None, help="Write the report to this file")
+    args = parser.parse_args()
+
+    documents = EQUIVALENCE_CORPUS + [exam_document(50)] + random_documents(args.random)
+    mismatches = check_equivalence(documents)
+    if mismatches:
+        print(f"❌ {len(mismatches)} of {len(documents)} document(s) cleaned differently, e.g.:")
+        for doc in mismatches[:5]:
+            print(f"   {doc!r}")
+        sys.exit(1)
+    print(f"✓ Identical output on {len(documents)} documents")
+
+    report = run_benchmark(args.sizes, args.repeat)
+    print(f"\n{'questions':>9} {'MB':>6} {'legacy s':>9} {'single s':>9} {'speedup':>8}")
+    for run in report["runs"]:
+        print(f"{run['questions']:>9} {run['megabytes']:>6} {run['legacy_seconds']:>9} "
+              f"{run['single_pass_seconds']:>9} {run['speedup']:>7}x")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.json}")
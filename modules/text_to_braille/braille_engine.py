@@ -15,15 +15,23 @@ def text_to_braille(text: str) -> str:
     return "".join(BRAILLE_MAP.get(ch.lower(), ch) for ch in text)
 
 def convert_to_braille(tagged_lines: list, output_dir="outputs") -> str:
-    os.makedirs(output_dir, exist_ok=True)
+    return write_braille(tagged_lines, output_dir)
 
-    braille_lines = [text_to_braille(line) for line in tagged_lines]
-    braille_text = "\n".join(braille_lines)
+def write_braille(tagged_lines, output_dir="outputs") -> str:
+    """
+    Translates tagged lines one at a time and writes them straight to a new
+    .brf file, so any iterable (e.g. a generator pipeline) can be converted
+    without holding the whole document. Returns the file path.
+    """
+    os.makedirs(output_dir, exist_ok=True)
 
     file_name = f"braille_{uuid.uuid4()}.brf"
     file_path = os.path.join(output_dir, file_name)
 
     with open(file_path, "w", encoding="utf-8") as f:
-        f.write(braille_text)
+        for i, line in enumerate(tagged_lines):
+            if i:
+                f.write("\n")
+            f.write(text_to_braille(line))
 
     return file_path
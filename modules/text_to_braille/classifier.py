@@ -7,8 +7,14 @@ def classify_text(cleaned_text: str) -> list:
     Returns a list of dictionaries with classification.
     """
 
-    lines = cleaned_text.split("\n")
-    classified = []
+    return list(iter_classify(cleaned_text.split("\n")))
+
+
+def iter_classify(lines):
+    """
+    Streaming form of classify_text: takes any iterable of lines and
+    yields one classification dict per non-empty line.
+    """
 
     for line in lines:
         l = line.strip()
@@ -20,26 +26,24 @@ def classify_text(cleaned_text: str) -> list:
 
         # 1️⃣ Detect Headings (Section, Part, etc.)
         if re.match(r'^(SECTION|PART|UNIT)\b', l, re.IGNORECASE):
-            classified.append({"type": "heading", "content": l})
+            yield {"type": "heading", "content": l}
         
         # 2️⃣ Detect Questions: "1.", "Q1", "Question 1"
         elif re.match(r'^(Q?\d+[\).])', l, re.IGNORECASE) or l.lower().startswith("question"):
-            classified.append({"type": "question", "content": l})
+            yield {"type": "question", "content": l}
 
         # 3️⃣ Detect MCQ Options: A / B / C patterns
         elif re.match(r'^[\(\[]?[A-Da-d][\)\]].*', l):  # (A), A), A.
-            classified.append({"type": "option", "content": l})
+            yield {"type": "option", "content": l}
 
         # 4️⃣ Detect equations (simple pattern: digits + symbols)
         elif re.search(r'[0-9]+[\+\-\*/=][0-9]+', l):
-            classified.append({"type": "equation", "content": l})
+            yield {"type": "equation", "content": l}
 
         # 5️⃣ Detect Table-like structures
         elif re.search(r'\|', l) or re.search(r'\t', l):
-            classified.append({"type": "table", "content": l})
+            yield {"type": "table", "content": l}
 
         # 6️⃣ Everything else = normal text
         else:
-            classified.append({"type": "text", "content": l})
-
-    return classified
+            yield {"type": "text", "content": l}
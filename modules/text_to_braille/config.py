@@ -0,0 +1,35 @@
+"""
+Configuration management for the text-to-braille API.
+"""
+import os
+
+class Config:
+    """Configuration settings for the braille conversion module."""
+
+    def __init__(self):
+        # Conversion worker pool: "thread" or "process"
+        self.BRAILLE_EXECUTOR: str = os.getenv("BRAILLE_EXECUTOR", "thread")
+        self.BRAILLE_WORKERS: int = int(os.getenv("BRAILLE_WORKERS") or os.cpu_count() or 1)
+        # How process workers are started: "forkserver" or "spawn" (never fork)
+        self.BRAILLE_START_METHOD: str = os.getenv("BRAILLE_START_METHOD", "forkserver")
+
+        # Generator pipeline that writes the .brf page by page (constant memory)
+        self.BRAILLE_STREAMING: bool = os.getenv("BRAILLE_STREAMING", "false").lower() == "true"
+
+        # Page-parallel PDF extraction (one shared process pool; used from this many pages up)
+        self.PDF_WORKERS: int = int(os.getenv("PDF_WORKERS") or os.cpu_count() or 1)
+        self.PDF_PARALLEL_MIN_PAGES: int = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+        # How the shared extraction pool starts its workers: "forkserver" or "spawn"
+        self.PDF_START_METHOD: str = os.getenv("PDF_START_METHOD", "forkserver")
+
+        # Uploads are streamed to disk in chunks and rejected (413) above the size limit
+        self.MAX_UPLOAD_BYTES: int = int(os.getenv("MAX_UPLOAD_BYTES", "52428800"))
+        self.UPLOAD_CHUNK_SIZE: int = int(os.getenv("UPLOAD_CHUNK_SIZE", "1048576"))
+
+        # Uploads of at least this size become background jobs (0 = always convert inline)
+        self.BRAILLE_JOB_THRESHOLD_BYTES: int = int(os.getenv("BRAILLE_JOB_THRESHOLD_BYTES", "2000000"))
+        # Finished jobs kept for GET /jobs/{id} before the oldest are forgotten
+        self.BRAILLE_JOB_HISTORY: int = int(os.getenv("BRAILLE_JOB_HISTORY", "1000"))
+
+# Global config instance
+config = Config()
@@ -1,13 +1,85 @@
 import os
+import time
+import logging
+import threading
+import multiprocessing
+from collections import deque
 import pdfplumber
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from docx import Document
 
-def extract_text(file_path):
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+# Shared page-extraction pool, started once by the API process (see start_pdf_pool)
+_pdf_pool = None
+_pdf_pool_pid = None
+_pdf_pool_workers = 1
+_pdf_pool_lock = threading.Lock()
+
+
+def start_pdf_pool(workers=None):
+    """
+    Starts the process pool used for page-parallel PDF extraction.
+
+    One bounded pool (PDF_WORKERS processes) is shared by every request of
+    the process that started it. Workers come from a "forkserver" or "spawn"
+    context (PDF_START_METHOD), so they are never forked from the threads of
+    a running server. Processes that did not start a pool, such as the
+    BRAILLE_EXECUTOR=process workers, extract pages serially.
+    """
+    global _pdf_pool, _pdf_pool_pid, _pdf_pool_workers
+    workers = workers or config.PDF_WORKERS
+    with _pdf_pool_lock:
+        if _pdf_pool is None and workers > 1:
+            method = config.PDF_START_METHOD
+            if method not in multiprocessing.get_all_start_methods():
+                method = "spawn"
+            _pdf_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+            _pdf_pool_pid = os.getpid()
+            _pdf_pool_workers = workers
+            logger.info(f"📄 PDF extraction pool: {workers} {method} worker(s)")
+        return _pdf_pool
+
+
+def shutdown_pdf_pool():
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None and _pdf_pool_pid == os.getpid():
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+        _pdf_pool = None
+
+
+def _shared_pdf_pool():
+    # A pool inherited through fork belongs to the parent process
+    with _pdf_pool_lock:
+        return _pdf_pool if _pdf_pool_pid == os.getpid() else None
+
+
+def _replace_broken_pool(pool):
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not pool:
+            return  # another request already replaced it
+        _pdf_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+    start_pdf_pool(_pdf_pool_workers)
+
+
+def extract_text(file_path, page_timings=None):
+    """
+    Extracts the text of a PDF, DOCX or TXT file.
+
+    If page_timings is a list, the extraction seconds of each PDF page are
+    appended to it (nothing is appended for DOCX / TXT).
+    """
     _, ext = os.path.splitext(file_path)
     ext = ext.lower()
 
     if ext == ".pdf":
-        return extract_from_pdf(file_path)
+        return extract_from_pdf(file_path, page_timings)
     elif ext == ".docx":
         return extract_from_docx(file_path)
     elif ext == ".txt":
@@ -16,13 +88,158 @@ def extract_text(file_path):
         return "❌ Unsupported file format"
 
 
-def extract_from_pdf(file_path):
-    text = ""
+def extract_from_pdf(file_path, page_timings=None):
+    pages = extract_pdf_pages(file_path)
+    if page_timings is not None:
+        page_timings.extend(seconds for _, seconds in pages)
+    return "".join(text + "\n" for text, _ in pages).strip()
+
+
+def extract_pdf_pages(file_path):
+    """
+    Extracts every page of a PDF, in order, as (text, seconds) pairs.
+
+    Documents with at least PDF_PARALLEL_MIN_PAGES pages are split into
+    contiguous page ranges that are extracted in the shared process pool
+    (pdfplumber layout analysis is CPU-bound and holds the GIL). Without a
+    started pool the pages are extracted serially in this process.
+    """
+    pool = _shared_pdf_pool()
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+        if pool is None or page_count < config.PDF_PARALLEL_MIN_PAGES:
+            pages = _extract_pages(pdf, 0, page_count)
+            _log_timings(pages, workers=1)
+            return pages
+
+    workers = _pdf_pool_workers
+    ranges = _page_ranges(page_count, workers)
+    try:
+        results = pool.map(_extract_page_range, [file_path] * len(ranges), *zip(*ranges))
+        pages = [page for chunk in results for page in chunk]
+    except (OSError, RuntimeError) as e:
+        if isinstance(e, BrokenProcessPool):
+            # A worker died (e.g. killed for memory); start a fresh pool for later calls
+            _replace_broken_pool(pool)
+        logger.warning(f"⚠️ Parallel PDF extraction failed ({e}), extracting serially")
+        with pdfplumber.open(file_path) as pdf:
+            pages = _extract_pages(pdf, 0, page_count)
+        workers = 1
+    _log_timings(pages, workers)
+    return pages
+
+
+def _page_ranges(page_count, workers):
+    # A few ranges per worker, so one slow range does not leave the others idle
+    range_size = max(1, -(-page_count // (workers * 4)))
+    return [(start, min(start + range_size, page_count)) for start in range(0, page_count, range_size)]
+
+
+def _extract_page_range(file_path, start, stop):
+    with pdfplumber.open(file_path) as pdf:
+        return _extract_pages(pdf, start, stop)
+
+
+def _extract_pages(pdf, start, stop):
+    pages = []
+    for page in pdf.pages[start:stop]:
+        began = time.perf_counter()
+        text = page.extract_text() or ""
+        pages.append((text, time.perf_counter() - began))
+        page.close()  # drop the cached layout objects of finished pages
+    return pages
+
+
+def _log_timings(pages, workers):
+    if not pages:
+        return
+    seconds = [t for _, t in pages]
+    slowest = max(range(len(seconds)), key=seconds.__getitem__)
+    logger.info(
+        f"📄 Extracted {len(pages)} page(s) with {workers} worker(s): "
+        f"{sum(seconds):.2f}s page time, slowest page {slowest + 1} ({seconds[slowest]:.2f}s)"
+    )
+
+
+def iter_text(file_path, txt_block_lines=1000, page_timings=None):
+    """
+    Yields the document piece by piece for the streaming pipeline: one PDF
+    page, one DOCX paragraph or a block of TXT lines at a time, so only the
+    current piece is held in memory. Each piece keeps its trailing newline;
+    joined together they equal extract_text() before its final strip().
+    PDF page seconds are appended to page_timings, as in extract_text().
+    """
+    _, ext = os.path.splitext(file_path)
+    ext = ext.lower()
+
+    if ext == ".pdf":
+        for text, seconds in iter_pdf_pages(file_path):
+            if page_timings is not None:
+                page_timings.append(seconds)
+            yield text + "\n"
+    elif ext == ".docx":
+        for para in Document(file_path).paragraphs:
+            yield para.text + "\n"
+    elif ext == ".txt":
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            block = []
+            for line in f:
+                block.append(line)
+                if len(block) >= txt_block_lines:
+                    yield "".join(block)
+                    block = []
+            if block:
+                yield "".join(block)
+    else:
+        yield "❌ Unsupported file format"
+
+
+def iter_pdf_pages(file_path):
+    """
+    Yields the pages of a PDF, in order, as (text, seconds) pairs.
+
+    Large documents (see extract_pdf_pages) are extracted in the shared pool,
+    with at most two page ranges per worker in flight: each range is yielded
+    as soon as it and every range before it are done, so memory stays bounded
+    by the window rather than the document. If the pool fails, the remaining
+    pages are extracted serially.
+    """
+    pool = _shared_pdf_pool()
+    with pdfplumber.open(file_path) as pdf:
+        page_count = len(pdf.pages)
+    if pool is None or page_count < config.PDF_PARALLEL_MIN_PAGES:
+        yield from _iter_pages_serially(file_path, 0)
+        return
+
+    ranges = deque(_page_ranges(page_count, _pdf_pool_workers))
+    pending = deque()
+    next_page = 0
+    try:
+        while ranges or pending:
+            while ranges and len(pending) < _pdf_pool_workers * 2:
+                start, stop = ranges.popleft()
+                pending.append(pool.submit(_extract_page_range, file_path, start, stop))
+            chunk = pending.popleft().result()
+            for page in chunk:
+                yield page
+            next_page += len(chunk)
+    except (OSError, RuntimeError) as e:
+        if isinstance(e, BrokenProcessPool):
+            _replace_broken_pool(pool)
+        logger.warning(f"⚠️ Parallel PDF extraction failed ({e}), extracting pages {next_page + 1}+ serially")
+        yield from _iter_pages_serially(file_path, next_page)
+    finally:
+        for future in pending:
+            future.cancel()  # the consumer stopped early
+
+
+def _iter_pages_serially(file_path, start):
     with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() or ""
-            text += "\n"
-    return text.strip()
+        for page in pdf.pages[start:]:
+            began = time.perf_counter()
+            text = page.extract_text() or ""
+            page.close()
+            yield text, time.perf_counter() - began
 
 
 def extract_from_docx(file_path):
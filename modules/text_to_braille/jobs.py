@@ -0,0 +1,159 @@
+"""
+Worker pool and background jobs for the braille conversion pipeline.
+
+The pipeline is CPU-bound (pdfplumber layout analysis in particular), so it
+never runs on the FastAPI event loop. Small uploads are awaited through the
+pool; large ones are submitted as jobs and polled via GET /jobs/{id}.
+"""
+from fastapi import APIRouter, HTTPException
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+
+from app.config import config
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+class _Job:
+    def __init__(self, future: Future, metadata: Dict[str, Any]):
+        self.future = future
+        self.metadata = metadata
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def status(self) -> str:
+        if not self.future.done():
+            return "running" if self.future.running() else "queued"
+        if self.future.cancelled() or self.future.exception() is not None:
+            return "failed"
+        return "completed"
+
+
+class JobManager:
+    """Runs pipeline calls in a thread or process pool and tracks background jobs."""
+
+    def __init__(self, executor: Optional[str] = None, workers: Optional[int] = None, history: Optional[int] = None):
+        """
+        Args:
+            executor: "thread" or "process" (defaults to config.BRAILLE_EXECUTOR)
+            workers: Pool size (defaults to config.BRAILLE_WORKERS)
+            history: Finished jobs kept for status queries (defaults to config.BRAILLE_JOB_HISTORY)
+        """
+        self.kind = (executor or config.BRAILLE_EXECUTOR).lower()
+        if self.kind not in ("thread", "process"):
+            raise ValueError(f"Unknown BRAILLE_EXECUTOR: {self.kind!r} (expected 'thread' or 'process')")
+        self.workers = workers or config.BRAILLE_WORKERS
+        self.history = config.BRAILLE_JOB_HISTORY if history is None else history
+        self.executor = None
+        self._jobs: "OrderedDict[str, _Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Creates the pool (called from the API startup hook, not at import).
+
+        Process workers come from a "forkserver" or "spawn" context
+        (BRAILLE_START_METHOD), so they are never forked from the threads of
+        a running server, and importing this module never starts processes.
+        """
+        with self._lock:
+            if self.executor is not None:
+                return self.executor
+            if self.kind == "process":
+                method = config.BRAILLE_START_METHOD
+                if method not in multiprocessing.get_all_start_methods():
+                    method = "spawn"
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(method))
+                logger.info(f"🧵 Braille pipeline pool: {self.workers} {method} process worker(s)")
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="braille")
+                logger.info(f"🧵 Braille pipeline pool: {self.workers} thread worker(s)")
+            return self.executor
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """Await fn(*args) in the pool without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.start(), fn, *args)
+
+    def submit(self, fn: Callable, *args, metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Start fn(*args) as a background job and return its job ID."""
+        job_id = str(uuid.uuid4())
+        job = _Job(self.start().submit(fn, *args), metadata or {})
+        with self._lock:
+            self._jobs[job_id] = job
+            self._forget_old_jobs()
+        job.future.add_done_callback(lambda f: self._finished(job_id, job))
+        return job_id
+
+    def get(self, job_id: str) -> Optional[_Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finished(self, job_id: str, job: _Job):
+        job.finished_at = time.time()
+        error = None if job.future.cancelled() else job.future.exception()
+        if error is not None:
+            logger.error(f"❌ Braille job {job_id} failed: {error}")
+
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.future.done()]
+        for job_id in finished[:max(len(finished) - self.history, 0)]:
+            del self._jobs[job_id]
+
+
+# Global pool shared by the upload and job endpoints (created by start())
+job_manager = JobManager()
+
+
+def _describe(job_id: str, job: _Job) -> dict:
+    return {
+        "job_id": job_id,
+        "status": job.status,
+        "submitted_at": job.submitted_at,
+        "finished_at": job.finished_at,
+        **job.metadata
+    }
+
+
+@router.get("/{job_id}")
+def job_status(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job ID")
+    return _describe(job_id, job)
+
+
+@router.get("/{job_id}/result")
+def job_result(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job ID")
+
+    status = job.status
+    if status in ("queued", "running"):
+        raise HTTPException(status_code=409, detail=f"Job is still {status}")
+    if status == "failed":
+        error = "cancelled" if job.future.cancelled() else str(job.future.exception())
+        raise HTTPException(status_code=500, detail=f"Conversion failed: {error}")
+
+    return {
+        "message": "✅ File converted to Braille successfully!",
+        **_describe(job_id, job),
+        **job.future.result()
+    }
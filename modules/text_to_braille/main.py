@@ -1,9 +1,22 @@
 from fastapi import FastAPI
 from app.upload_handler import router as upload_router
+from app.jobs import router as jobs_router, job_manager
+from app.extractor import start_pdf_pool, shutdown_pdf_pool
 
 app = FastAPI(title="Braille Converter API")
 
 app.include_router(upload_router)
+app.include_router(jobs_router)
+
+@app.on_event("startup")
+def start_workers():
+    job_manager.start()
+    start_pdf_pool()
+
+@app.on_event("shutdown")
+def shutdown_workers():
+    job_manager.shutdown()
+    shutdown_pdf_pool()
 
 @app.get("/")
 def home():
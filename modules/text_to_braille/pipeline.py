@@ -0,0 +1,120 @@
+from app.extractor import extract_text, iter_text  # Step 3
+from app.preprocessor import clean_text            # Step 4
+from app.classifier import classify_text, iter_classify  # Step 5
+from app.tagger import apply_tags, iter_tags       # Step 6
+from app.braille_engine import convert_to_braille, write_braille  # Step 7
+
+NO_TEXT_MESSAGE = "No extractable text found (possible scanned PDF)."
+PREVIEW_CHARS = 300
+PREVIEW_ITEMS = 10
+
+
+def run_pipeline(file_path: str, output_dir: str = "outputs") -> dict:
+    """
+    Runs the full conversion for one saved upload: extract → clean →
+    classify → tag → braille.
+
+    This is CPU-bound and blocking, so the API runs it in a worker pool
+    (see jobs.py) rather than on the event loop. It is a plain module-level
+    function so it can also be sent to a process pool.
+    Returns the previews, the extraction seconds of each PDF page and the
+    path of the generated .brf file.
+    """
+
+    # 3️⃣ Extract text
+    page_timings = []
+    raw_text = extract_text(file_path, page_timings)
+    if not raw_text or raw_text.strip() == "":
+        raw_text = NO_TEXT_MESSAGE
+
+    # 4️⃣ Clean text
+    cleaned_text = clean_text(raw_text)
+
+    # 5️⃣ Classify structure
+    classified_output = classify_text(cleaned_text)
+
+    # 6️⃣ Apply Braille-ready tags
+    tagged_output = apply_tags(classified_output)
+
+    # 7️⃣ Convert to Braille (.brf)
+    braille_file_path = convert_to_braille(tagged_output, output_dir)
+
+    return {
+        # Previews for verification
+        "raw_text_preview": raw_text[:PREVIEW_CHARS],
+        "cleaned_text_preview": cleaned_text[:PREVIEW_CHARS],
+        "classification_preview": classified_output[:PREVIEW_ITEMS],
+        "tagged_preview": tagged_output[:PREVIEW_ITEMS],
+        "page_timings": _rounded(page_timings),
+
+        # ✅ FINAL OUTPUT
+        "braille_file_path": braille_file_path
+    }
+
+
+def run_streaming_pipeline(file_path: str, output_dir: str = "outputs") -> dict:
+    """
+    Same conversion as run_pipeline, but every stage is a generator and the
+    .brf file is written line by line, so peak memory is bounded by one page
+    instead of the whole document.
+
+    Text is cleaned one page (PDF), paragraph (DOCX) or block of lines (TXT)
+    at a time. The braille output matches run_pipeline except where a
+    cleaning pattern would have matched across a page boundary (e.g. "Page"
+    at the bottom of one page and a number at the top of the next).
+    """
+    raw_head, cleaned_head = [], []
+    classified_head, tagged_head = [], []
+    page_timings = []
+
+    # 3️⃣ Extract page by page
+    def pages():
+        found_text = False
+        for piece in iter_text(file_path, page_timings=page_timings):
+            found_text = found_text or bool(piece.strip())
+            if len("".join(raw_head).lstrip()) < PREVIEW_CHARS:
+                raw_head.append(piece)
+            yield piece
+        if not found_text:
+            raw_head[:] = [NO_TEXT_MESSAGE]
+            yield NO_TEXT_MESSAGE
+
+    # 4️⃣ Clean each page, then hand on its lines
+    def lines():
+        for piece in pages():
+            cleaned = clean_text(piece)
+            if cleaned and len("\n".join(cleaned_head)) < PREVIEW_CHARS:
+                cleaned_head.append(cleaned)
+            yield from cleaned.split("\n")
+
+    # 5️⃣ + 6️⃣ Classify and tag as lines arrive
+    classified = _keep_head(iter_classify(lines()), classified_head)
+    tagged = _keep_head(iter_tags(classified), tagged_head)
+
+    # 7️⃣ Write the .brf file incrementally
+    braille_file_path = write_braille(tagged, output_dir)
+
+    return {
+        # Previews for verification
+        "raw_text_preview": "".join(raw_head).strip()[:PREVIEW_CHARS],
+        "cleaned_text_preview": "\n".join(cleaned_head)[:PREVIEW_CHARS],
+        "classification_preview": classified_head,
+        "tagged_preview": tagged_head,
+        "page_timings": _rounded(page_timings),
+
+        # ✅ FINAL OUTPUT
+        "braille_file_path": braille_file_path
+    }
+
+
+def _keep_head(items, head: list, limit: int = PREVIEW_ITEMS):
+    """Passes items through, keeping the first `limit` of them in head."""
+    for item in items:
+        if len(head) < limit:
+            head.append(item)
+        yield item
+
+
+def _rounded(seconds: list) -> list:
+    """Per-page extraction seconds for the response (empty for DOCX / TXT)."""
+    return [round(t, 4) for t in seconds]
@@ -1,28 +1,142 @@
 import re
 
+# Rules compiled once, shared by clean_text and clean_text_legacy
+PAGE_NUMBER = re.compile(r'Page\s*\d+', re.IGNORECASE)
+PAGE_AT_LINE_END = re.compile(r'Page\s*$', re.IGNORECASE)
+FRACTION = re.compile(r'\b\d+\s*/\s*\d+\b')  # "2/5"
+NAME_HEADER = re.compile(r'^\s*Name:.*$', re.MULTILINE)
+DATE_HEADER = re.compile(r'^\s*Date:.*$', re.MULTILINE)
+DECORATION = re.compile(r'[-*_=~]{3,}')
+BULLET = re.compile(r'[•●▪◦]')
+BLANK_LINES = re.compile(r'\n{3,}')
+SPACES = re.compile(r'[ ]{2,}')
+
+
 def clean_text(raw_text: str) -> str:
+    """
+    Single-pass cleaner: applies the rules of clean_text_legacy line by line
+    and gives exactly the same output, without copying the whole text once
+    per rule. Cheap substring checks skip the rules a line cannot match.
+
+    "Page 3" and "2/5" can also match across a line break (e.g. "Page" at
+    the end of one line and "3" at the start of the next); when a document
+    could contain such a match it is cleaned with clean_text_legacy instead.
+    """
+    if not raw_text:
+        return ""
+
+    text = _clean_lines(raw_text)
+    if text is None:
+        return clean_text_legacy(raw_text)
+    return text
+
+
+def _clean_lines(raw_text: str):
+    """Returns the cleaned text, or None when a rule could span two lines."""
+
+    output = []
+    emit = output.append
+    pending = []       # whitespace-only lines a Name:/Date: header would swallow
+    name_mark = 0      # pending[name_mark:] are the ones since the last Name: header
+    last_blank = False
+
+    for line in raw_text.split("\n"):
+
+        # 1️⃣ Remove page numbers & "Page X", then fractions
+        if "/" in line or "age" in line.lower():
+            if PAGE_AT_LINE_END.search(line):
+                return None
+            line = PAGE_NUMBER.sub('', line)
+            if "/" in line:
+                edge = line.strip()
+                if edge[:1] == "/" or edge[-1:] == "/":
+                    return None
+                line = FRACTION.sub('', line)
+
+        # 2️⃣ Remove headers / footers. "^\s*Name:" also eats the whitespace-only
+        #    lines above it, and the Date: pass runs on the Name: pass output
+        if not line or line.isspace():
+            pending.append(line)
+            continue
+        if ":" in line:
+            header = line.lstrip()
+            if header.startswith("Name:"):
+                del pending[name_mark:]
+                pending.append("")
+                name_mark = len(pending)
+                continue
+            if header.startswith("Date:"):
+                pending.clear()
+                name_mark = 0
+                if not last_blank:
+                    emit("")
+                    last_blank = True
+                continue
+
+        if pending:
+            for kept in pending:
+                last_blank = _emit_line(emit, kept, last_blank)
+            pending.clear()
+            name_mark = 0
+
+        # 3️⃣ Remove decorative characters
+        if "-" in line or "*" in line or "_" in line or "=" in line or "~" in line:
+            line = DECORATION.sub('', line)
+
+        # 4️⃣ Clean bullet symbols → "-"
+        if not line.isascii():
+            line = BULLET.sub('-', line)
+
+        last_blank = _emit_line(emit, line, last_blank)
+
+    for kept in pending:
+        last_blank = _emit_line(emit, kept, last_blank)
+
+    # 6️⃣ Trim whitespace
+    return "\n".join(output).strip()
+
+
+def _emit_line(emit, line: str, last_blank: bool) -> bool:
+    # 5️⃣ Limit blank lines (runs of empty lines → one), extra spaces, tabs → spaces
+    if not line:
+        if not last_blank:
+            emit(line)
+        return True
+    if "  " in line:
+        line = SPACES.sub(' ', line)
+    if "\t" in line:
+        line = line.replace('\t', ' ')
+    emit(line)
+    return False
+
+
+def clean_text_legacy(raw_text: str) -> str:
+    """
+    Reference implementation: one regex pass over the whole text per rule.
+    clean_text must produce exactly the same output (see bench_preprocessor.py).
+    """
     if not raw_text:
         return ""
 
     text = raw_text
 
     # 1️⃣ Remove page numbers & "Page X"
-    text = re.sub(r'Page\s*\d+','', text, flags=re.IGNORECASE)
-    text = re.sub(r'\b\d+\s*/\s*\d+\b', '', text)  # "2/5"
+    text = PAGE_NUMBER.sub('', text)
+    text = FRACTION.sub('', text)  # "2/5"
 
     # 2️⃣ Remove headers / footers (common patterns)
-    text = re.sub(r'^\s*Name:.*$','', text, flags=re.MULTILINE)
-    text = re.sub(r'^\s*Date:.*$','', text, flags=re.MULTILINE)
+    text = NAME_HEADER.sub('', text)
+    text = DATE_HEADER.sub('', text)
 
     # 3️⃣ Remove decorative characters
-    text = re.sub(r'[-*_=~]{3,}', '', text)
+    text = DECORATION.sub('', text)
 
     # 4️⃣ Clean bullet symbols → "-"
-    text = re.sub(r'[•●▪◦]', '-', text)
+    text = BULLET.sub('-', text)
 
     # 5️⃣ Replace multiple spaces/newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)       # limit blank lines
-    text = re.sub(r'[ ]{2,}', ' ', text)        # remove extra spaces
+    text = BLANK_LINES.sub('\n\n', text)       # limit blank lines
+    text = SPACES.sub(' ', text)        # remove extra spaces
 
     # 6️⃣ Numbering fixes for multi-column like "1. 2. 3."
     text = text.replace('\t', ' ')  # tabs → spaces
@@ -4,33 +4,39 @@ def apply_tags(classified_list: list) -> list:
     Returns a list of tagged lines.
     """
 
-    tagged_output = []
+    return list(iter_tags(classified_list))
+
+
+def iter_tags(classified_items):
+    """
+    Streaming form of apply_tags: yields one tagged line per classified
+    item. Question numbering continues across the whole stream.
+    """
+
     q_count = 0
 
-    for item in classified_list:
+    for item in classified_items:
         text = item["content"]
         t = item["type"]
 
         if t == "heading":
-            tagged_output.append(f"#H1: {text}")
+            yield f"#H1: {text}"
 
         elif t == "question":
             q_count += 1
-            tagged_output.append(f"#Q{q_count}: {text}")
+            yield f"#Q{q_count}: {text}"
 
         elif t == "option":
-            tagged_output.append(text)
+            yield text
 
         elif t == "equation":
-            tagged_output.append(f"#EQ: {text}")
+            yield f"#EQ: {text}"
 
         elif t == "table":
-            tagged_output.append(f"#TB: {text}")
+            yield f"#TB: {text}"
 
         elif t == "text":
-            tagged_output.append(f"#T: {text}")
+            yield f"#T: {text}"
 
         else:
-            tagged_output.append(text)
-
-    return tagged_output
+            yield text
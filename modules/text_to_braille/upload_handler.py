@@ -1,13 +1,13 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import JSONResponse
+import hashlib
 import os
 import uuid
 
-# Pipeline imports
-from app.extractor import extract_text          # Step 3
-from app.preprocessor import clean_text         # Step 4
-from app.classifier import classify_text        # Step 5
-from app.tagger import apply_tags               # Step 6
-from app.braille_engine import convert_to_braille  # Step 7
+# Pipeline (steps 3-7) and the worker pool it runs in
+from app.pipeline import run_pipeline, run_streaming_pipeline
+from app.jobs import job_manager
+from app.config import config
 
 router = APIRouter(prefix="/upload", tags=["Upload"])
 
@@ -21,6 +21,36 @@ os.makedirs(OUTPUT_DIR, exist_ok=True)
 ALLOWED_EXTENSIONS = {".pdf", ".docx", ".txt"}
 
 
+async def save_upload(file: UploadFile, file_path: str) -> tuple:
+    """
+    Streams an upload to disk in UPLOAD_CHUNK_SIZE chunks, hashing it in the
+    same pass, so memory stays flat however large the file is.
+    Raises 413 (and removes the partial file) once MAX_UPLOAD_BYTES is exceeded.
+    Returns (size in bytes, sha256 hex digest).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(file_path, "wb") as f:
+            while True:
+                chunk = await file.read(config.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > config.MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File exceeds the {config.MAX_UPLOAD_BYTES} byte upload limit"
+                    )
+                digest.update(chunk)
+                f.write(chunk)
+    except BaseException:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+    return size, digest.hexdigest()
+
+
 @router.post("/")
 async def upload_assessment(file: UploadFile = File(...)):
     # 1️⃣ Validate file extension
@@ -31,43 +61,44 @@ async def upload_assessment(file: UploadFile = File(...)):
             detail="Only PDF, DOCX, and TXT files are supported"
         )
 
-    # 2️⃣ Save uploaded file
+    # Reject early when the client declared an oversized file
+    if file.size is not None and file.size > config.MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds the {config.MAX_UPLOAD_BYTES} byte upload limit"
+        )
+
+    # 2️⃣ Stream uploaded file to disk (size-limited, hashed on the fly)
     unique_name = f"{uuid.uuid4()}{ext}"
     file_path = os.path.join(UPLOAD_DIR, unique_name)
+    file_size, sha256 = await save_upload(file, file_path)
 
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
-
-    # 3️⃣ Extract text
-    raw_text = extract_text(file_path)
-    if not raw_text or raw_text.strip() == "":
-        raw_text = "No extractable text found (possible scanned PDF)."
-
-    # 4️⃣ Clean text
-    cleaned_text = clean_text(raw_text)
-
-    # 5️⃣ Classify structure
-    classified_output = classify_text(cleaned_text)
-
-    # 6️⃣ Apply Braille-ready tags
-    tagged_output = apply_tags(classified_output)
+    pipeline = run_streaming_pipeline if config.BRAILLE_STREAMING else run_pipeline
 
-    # 7️⃣ Convert to Braille (.brf)
-    braille_file_path = convert_to_braille(tagged_output, OUTPUT_DIR)
-
-    # 8️⃣ Final response
-    return {
-        "message": "✅ File uploaded and converted to Braille successfully!",
+    # 3️⃣ Large uploads → background job (poll GET /jobs/{id})
+    upload_info = {
         "original_filename": file.filename,
         "stored_filename": unique_name,
         "uploaded_file_path": file_path,
-
-        # Previews for verification
-        "raw_text_preview": raw_text[:300],
-        "cleaned_text_preview": cleaned_text[:300],
-        "classification_preview": classified_output[:10],
-        "tagged_preview": tagged_output[:10],
-
-        # ✅ FINAL OUTPUT
-        "braille_file_path": braille_file_path
+        "size_bytes": file_size,
+        "sha256": sha256,
+    }
+    if config.BRAILLE_JOB_THRESHOLD_BYTES and file_size >= config.BRAILLE_JOB_THRESHOLD_BYTES:
+        job_id = job_manager.submit(pipeline, file_path, OUTPUT_DIR, metadata=upload_info)
+        return JSONResponse(status_code=202, content={
+            "message": "⏳ File uploaded; Braille conversion is running in the background",
+            "job_id": job_id,
+            "status_url": f"/jobs/{job_id}",
+            "result_url": f"/jobs/{job_id}/result",
+            **upload_info
+        })
+
+    # 4️⃣ Small uploads → convert in the worker pool, off the event loop
+    pipeline_output = await job_manager.run(pipeline, file_path, OUTPUT_DIR)
+
+    # 5️⃣ Final response
+    return {
+        "message": "✅ File uploaded and converted to Braille successfully!",
+        **upload_info,
+        **pipeline_output
     }
@@ -1,13 +1,27 @@
-import spacy
 import os
 import re
+import sys
+
+# The model registry lives in text_simplifier; importing that single file from
+# here means a process running both modules shares one registry.
+_REGISTRY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "text_simplifier")
+if _REGISTRY_DIR not in sys.path:
+    sys.path.append(_REGISTRY_DIR)
+from model_registry import get_spacy_model  # noqa: E402
 from visuals.geometry import generate_triangle, generate_circle, generate_rectangle
 from visuals.physics import draw_force_diagram, draw_motion_vector
 from visuals.graphs import draw_linear_graph, draw_parabola, draw_hyperbola, draw_bar_graph, plot_points
 from visuals.derivative import draw_derivative
 
 
-nlp = spacy.load("en_core_web_sm")
+def __getattr__(name):
+    """
+    `nlp` used to be loaded at import time even though nothing here uses it.
+    It is now loaded on first access through the shared model registry.
+    """
+    if name == "nlp":
+        return get_spacy_model("en_core_web_sm")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ----------------- Utility Functions -----------------
 def extract_numbers(text):